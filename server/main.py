@@ -16,7 +16,7 @@ load_dotenv()
 
 # Import enhanced error handling and monitoring
 from utils.error_handling import error_handler, handle_graceful_degradation, with_retry, RetryConfig, ErrorClassifier
-from utils.logging_config import setup_logging, get_request_logger, performance_logger
+from utils.logging_config import setup_logging, stop_logging, get_request_logger, performance_logger
 from utils.health_monitor import health_monitor, register_default_health_checks
 
 # Set up comprehensive logging
@@ -488,6 +488,9 @@ async def shutdown_event():
     except Exception as e:
         logger.critical(f"Critical error during shutdown: {e}", exc_info=True)
         error_handler.record_error(ErrorClassifier.classify_error(e))
+    finally:
+        # Flush queued log records and stop the logging threads
+        stop_logging()
 
 # Import API models
 from models.api import (
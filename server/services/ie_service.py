@@ -18,7 +18,7 @@ from pydantic import ValidationError
 from models.core import Entity, Relationship, IEResult, EntityType, RelationType, Evidence, SourceSpan
 from utils.error_handling import (
     error_handler, with_retry, handle_graceful_degradation,
-    RetryConfig, ErrorClassifier
+    RetryConfig, ErrorClassifier, ErrorCategory
 )
 from services.ai_provider import BaseAIProvider, get_ai_provider, AIProviderError
 
@@ -290,6 +290,7 @@ Return valid JSON with this exact structure:
     @with_retry(
         retry_config=RetryConfig(max_retries=3, base_delay=1.0, max_delay=60.0),
         circuit_breaker_name="ai_provider_api",
+        category=ErrorCategory.LLM_API,
         context={"service": "information_extraction", "operation": "llm_request"}
     )
     async def _make_llm_request(self, chunk_text: str) -> str:
@@ -16,7 +16,7 @@ import time
 from models.core import Entity, EntityType
 from utils.error_handling import (
     error_handler, with_retry, handle_graceful_degradation,
-    RetryConfig, ErrorClassifier
+    RetryConfig, ErrorClassifier, ErrorCategory
 )
 
 logger = logging.getLogger(__name__)
@@ -111,6 +111,7 @@ class QdrantAdapter:
     @with_retry(
         retry_config=RetryConfig(max_retries=3, base_delay=1.0, max_delay=30.0),
         circuit_breaker_name="qdrant_connection",
+        category=ErrorCategory.DATABASE,
         context={"service": "qdrant", "operation": "connect"}
     )
     async def connect(self) -> bool:
@@ -229,6 +230,7 @@ class QdrantAdapter:
     @with_retry(
         retry_config=RetryConfig(max_retries=2, base_delay=0.5, max_delay=5.0),
         circuit_breaker_name="qdrant_storage",
+        category=ErrorCategory.DATABASE,
         context={"service": "qdrant", "operation": "store_entity"}
     )
     async def store_entity(self, entity: Entity) -> bool:
@@ -0,0 +1,467 @@
+"""
+Unit tests for the error handling utilities.
+
+Covers retry execution, circuit breaker bookkeeping and error classification.
+"""
+
+import logging
+import threading
+import time
+from datetime import timezone
+
+import pytest
+from unittest.mock import patch
+
+from utils.error_handling import (
+    ErrorHandler, ErrorClassifier, ErrorCategory, ErrorSeverity, RetryConfig,
+    CircuitBreaker, CircuitBreakerConfig, CircuitBreakerState, with_retry,
+    handle_graceful_degradation
+)
+
+
+def no_delay_config(max_retries: int = 2) -> RetryConfig:
+    """Retry configuration that never sleeps between attempts"""
+    return RetryConfig(max_retries=max_retries, base_delay=0.0, jitter=False)
+
+
+class TestRetryConfig:
+    """Test cases for RetryConfig delay calculation."""
+
+    def test_no_jitter_is_exponential(self):
+        """Without jitter delays follow the capped exponential curve"""
+        config = RetryConfig(max_retries=2, base_delay=1.0, max_delay=5.0, jitter=False)
+        assert [config.get_delay(a) for a in range(0, 6)] == [0, 1.0, 2.0, 4.0, 5.0, 5.0]
+
+    def test_full_jitter_is_default(self):
+        """Full jitter draws between zero and the exponential delay"""
+        config = RetryConfig(base_delay=1.0, max_delay=60.0)
+        assert config.jitter_mode == "full"
+        for attempt in range(1, 6):
+            for _ in range(50):
+                assert 0 <= config.get_delay(attempt) <= 2 ** (attempt - 1)
+
+    def test_equal_jitter_keeps_half(self):
+        """Equal jitter never drops below half the exponential delay"""
+        config = RetryConfig(base_delay=1.0, jitter_mode="equal")
+        for _ in range(50):
+            assert 2.0 <= config.get_delay(3) <= 4.0
+
+    def test_decorrelated_jitter_bounds(self):
+        """Decorrelated jitter grows from the previous delay and respects the cap"""
+        config = RetryConfig(base_delay=1.0, max_delay=10.0, jitter_mode="decorrelated")
+        for _ in range(20):
+            previous = None
+            for attempt in range(1, 8):
+                delay = config.get_delay(attempt, previous)
+                upper = config.base_delay if previous is None else previous
+                assert config.base_delay <= delay <= min(10.0, upper * 3.0)
+                previous = delay
+
+    def test_decorrelated_jitter_sequences_are_independent(self):
+        """Interleaved retry loops sharing a config don't disturb each other"""
+        config = RetryConfig(base_delay=1.0, max_delay=1000.0, jitter_mode="decorrelated")
+        for _ in range(20):
+            grown = None
+            for attempt in range(1, 6):
+                grown = config.get_delay(attempt, grown)
+                # A fresh loop starting meanwhile must not reset the other one
+                assert config.get_delay(1) <= 3.0
+            assert config.get_delay(6, 1.0) <= 3.0
+
+    def test_configs_have_independent_generators(self):
+        """Each config draws jitter from its own random generator"""
+        first = RetryConfig()
+        second = RetryConfig()
+        assert first._rng is not second._rng
+        assert [first.get_delay(5) for _ in range(5)] != [second.get_delay(5) for _ in range(5)]
+
+    def test_unknown_jitter_mode(self):
+        """Unknown jitter modes are rejected"""
+        with pytest.raises(ValueError):
+            RetryConfig(jitter_mode="random")
+
+
+class TestCircuitBreaker:
+    """Test cases for the CircuitBreaker state machine."""
+
+    def test_opens_and_recovers_with_explicit_clock(self):
+        """State transitions follow the clock value passed in"""
+        breaker = CircuitBreaker(
+            "svc", CircuitBreakerConfig(failure_threshold=2, recovery_timeout=10.0)
+        )
+
+        breaker.record_failure(now=100.0)
+        breaker.record_failure(now=101.0)
+        assert breaker.state == CircuitBreakerState.OPEN
+        assert breaker.next_attempt_time == 111.0
+
+        assert not breaker.can_execute(now=110.9)
+        assert breaker.can_execute(now=111.0)
+        assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+    def test_status_reports_wall_clock_times(self):
+        """Status converts monotonic transition times to epoch seconds"""
+        breaker = CircuitBreaker(
+            "svc", CircuitBreakerConfig(failure_threshold=1, recovery_timeout=30.0)
+        )
+        assert breaker.get_status()["last_failure_time"] is None
+
+        breaker.record_failure()
+        status = breaker.get_status()
+        assert status["last_failure_time"] == pytest.approx(time.time(), abs=1.0)
+        assert status["next_attempt_time"] == pytest.approx(status["last_failure_time"] + 30.0)
+
+    def test_concurrent_failures_are_all_counted(self):
+        """Failures recorded from many threads are not lost"""
+        breaker = CircuitBreaker(
+            "svc", CircuitBreakerConfig(failure_threshold=10_000, recovery_timeout=10.0)
+        )
+
+        def fail_many():
+            for _ in range(1000):
+                breaker.record_failure()
+
+        threads = [threading.Thread(target=fail_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert breaker.failure_count == 8000
+
+    def test_no_instance_dict(self):
+        """Breakers and error records use slots instead of a __dict__"""
+        breaker = CircuitBreaker("svc", CircuitBreakerConfig())
+        info = ErrorClassifier.classify_error(ValueError("bad"))
+
+        for obj in (breaker, breaker.config, info):
+            assert not hasattr(obj, "__dict__")
+
+
+class TestExecuteWithRetry:
+    """Test cases for ErrorHandler.execute_with_retry."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.handler = ErrorHandler()
+
+    @pytest.mark.asyncio
+    async def test_success_does_not_classify(self):
+        """Successful calls never run error classification"""
+        async def succeed():
+            return "ok"
+
+        with patch.object(ErrorClassifier, "classify_error") as classify:
+            result = await self.handler.execute_with_retry(
+                succeed, circuit_breaker_name="svc", retry_config=no_delay_config()
+            )
+
+        assert result == "ok"
+        classify.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_single_attempt_fast_path_records_error(self):
+        """Zero-retry calls without a breaker still record their failure"""
+        calls = []
+
+        def fail():
+            calls.append(1)
+            raise ConnectionError("connection refused")
+
+        with pytest.raises(ConnectionError):
+            await self.handler.execute_with_retry(
+                fail, retry_config=no_delay_config(0), context={"op": "test"}
+            )
+
+        assert len(calls) == 1
+        assert len(self.handler.error_history) == 1
+        assert self.handler.error_history[0].context == {"op": "test"}
+        assert self.handler.circuit_breakers == {}
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_uses_category_config(self):
+        """The circuit breaker is created from the caller-supplied category"""
+        async def succeed():
+            return "ok"
+
+        await self.handler.execute_with_retry(
+            succeed, circuit_breaker_name="db", category=ErrorCategory.DATABASE
+        )
+
+        breaker = self.handler.circuit_breakers["db"]
+        assert breaker.config is self.handler.default_configs["database"]
+
+    @pytest.mark.asyncio
+    async def test_failures_recorded_on_circuit_breaker(self):
+        """Each failed attempt counts against the circuit breaker"""
+        calls = []
+
+        def fail():
+            calls.append(1)
+            raise ConnectionError("connection refused")
+
+        with pytest.raises(ConnectionError):
+            await self.handler.execute_with_retry(
+                fail, circuit_breaker_name="net", retry_config=no_delay_config(2)
+            )
+
+        assert len(calls) == 3
+        breaker = self.handler.circuit_breakers["net"]
+        assert breaker.failure_count == 3
+        assert breaker.state == CircuitBreakerState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_success_recorded_on_circuit_breaker(self):
+        """A success after failures decrements the failure count"""
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("connection reset")
+            return "ok"
+
+        result = await self.handler.execute_with_retry(
+            flaky, circuit_breaker_name="net", retry_config=no_delay_config(2)
+        )
+
+        assert result == "ok"
+        assert self.handler.circuit_breakers["net"].failure_count == 0
+
+
+class TestErrorHistory:
+    """Test cases for error history bookkeeping."""
+
+    def test_history_is_bounded(self):
+        """Oldest errors are evicted once the history is full"""
+        handler = ErrorHandler()
+        errors = [ErrorClassifier.classify_error(ValueError(f"bad {i}")) for i in range(1005)]
+
+        for error_info in errors:
+            handler.record_error(error_info)
+
+        assert len(handler.error_history) == handler.max_history_size
+        assert handler.error_history[0] is errors[5]
+
+        stats = handler.get_error_statistics()
+        assert stats["total_errors"] == 1000
+        assert len(stats["recent_errors"]) == 10
+        assert stats["recent_errors"][-1]["message"] == "bad 1004"
+
+    def test_statistics_counts(self):
+        """Statistics count errors by category and severity"""
+        handler = ErrorHandler()
+        for error in (ConnectionError("a"), ConnectionError("b"), MemoryError("c")):
+            handler.record_error(ErrorClassifier.classify_error(error))
+
+        stats = handler.get_error_statistics()
+        assert stats["by_category"] == {"network": 2, "system": 1}
+        assert stats["by_severity"] == {"medium": 2, "critical": 1}
+        assert [e["message"] for e in stats["recent_errors"]] == ["a", "b", "c"]
+
+
+class QdrantTimeoutError(Exception):
+    """Matches both the network and database keywords"""
+
+
+class OpenAIAPIError(Exception):
+    """Matches the LLM API keywords"""
+
+
+class TestErrorClassifier:
+    """Test cases for ErrorClassifier.classify_error."""
+
+    def test_error_ids_are_unique(self):
+        """Error ids do not collide within a burst"""
+        ids = {ErrorClassifier.classify_error(ValueError("x")).error_id for _ in range(1000)}
+        assert len(ids) == 1000
+        assert all(error_id.startswith("err_") for error_id in ids)
+
+    def test_network_error(self):
+        """Connection errors are recoverable network errors"""
+        info = ErrorClassifier.classify_error(ConnectionError("refused"))
+        assert info.category == ErrorCategory.NETWORK
+        assert info.severity == ErrorSeverity.MEDIUM
+        assert info.recoverable
+
+    def test_first_matching_category_wins(self):
+        """Network keywords take priority over database keywords"""
+        info = ErrorClassifier.classify_error(QdrantTimeoutError("slow"))
+        assert info.category == ErrorCategory.NETWORK
+
+    def test_llm_rate_limit_is_less_severe(self):
+        """Rate-limit messages lower the severity of LLM API errors"""
+        limited = ErrorClassifier.classify_error(OpenAIAPIError("Rate limit exceeded"))
+        failed = ErrorClassifier.classify_error(OpenAIAPIError("bad request"))
+
+        assert limited.category == ErrorCategory.LLM_API
+        assert limited.severity == ErrorSeverity.MEDIUM
+        assert failed.severity == ErrorSeverity.HIGH
+
+    def test_system_error_not_recoverable(self):
+        """Memory errors are critical and not recoverable"""
+        info = ErrorClassifier.classify_error(MemoryError())
+        assert info.category == ErrorCategory.SYSTEM
+        assert info.severity == ErrorSeverity.CRITICAL
+        assert not info.recoverable
+
+    def test_unknown_error(self):
+        """Unmatched errors fall back to UNKNOWN"""
+        info = ErrorClassifier.classify_error(KeyError("missing"))
+        assert info.category == ErrorCategory.UNKNOWN
+        assert info.severity == ErrorSeverity.MEDIUM
+
+    def test_timestamp_derived_from_epoch(self):
+        """The datetime timestamp is computed from the stored epoch seconds"""
+        before = time.time()
+        info = ErrorClassifier.classify_error(ValueError("bad"))
+
+        assert before <= info.timestamp_epoch <= time.time()
+        assert info.timestamp.tzinfo is timezone.utc
+        assert info.timestamp.timestamp() == pytest.approx(info.timestamp_epoch)
+
+    def test_traceback_formatted_lazily(self):
+        """Tracebacks are only formatted when requested"""
+        try:
+            raise KeyError("missing")
+        except KeyError as e:
+            info = ErrorClassifier.classify_error(e)
+
+        assert info.traceback is None
+        formatted = info.get_traceback()
+        assert "KeyError" in formatted
+        assert info.get_traceback() is formatted
+
+    def test_record_error_keeps_traceback_for_serious_errors(self):
+        """Recorded HIGH/CRITICAL errors keep their traceback"""
+        handler = ErrorHandler()
+        try:
+            raise MemoryError("out of memory")
+        except MemoryError as e:
+            serious = ErrorClassifier.classify_error(e)
+        minor = ErrorClassifier.classify_error(KeyError("missing"))
+
+        handler.record_error(serious)
+        handler.record_error(minor)
+
+        assert "MemoryError" in serious.traceback
+        assert minor.traceback is None
+
+    def test_record_error_logs_when_enabled(self, caplog):
+        """Recorded errors are logged with their structured fields"""
+        handler = ErrorHandler()
+        info = ErrorClassifier.classify_error(ConnectionError("refused"))
+
+        with caplog.at_level(logging.WARNING, logger="utils.error_handling"):
+            handler.record_error(info)
+
+        record = caplog.records[-1]
+        assert record.getMessage() == f"Error {info.error_id} [network]: refused"
+        assert record.error_id == info.error_id
+
+    def test_classification_cached_per_type(self):
+        """Repeated errors of the same class hit the classification cache"""
+        ErrorClassifier._classify_type.cache_clear()
+
+        ErrorClassifier.classify_error(ConnectionError("first"))
+        ErrorClassifier.classify_error(ConnectionError("second"))
+
+        info = ErrorClassifier._classify_type.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+
+class TestWithRetry:
+    """Test cases for the with_retry decorator."""
+
+    def test_sync_function_retries_without_event_loop(self):
+        """Sync functions are retried directly, without asyncio.run"""
+        attempts = []
+
+        @with_retry(retry_config=no_delay_config(2))
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("connection reset")
+            return "ok"
+
+        with patch("asyncio.run") as run:
+            assert flaky() == "ok"
+
+        run.assert_not_called()
+        assert len(attempts) == 3
+
+    def test_sync_function_non_recoverable_error(self):
+        """Non-recoverable errors are raised without retrying"""
+        attempts = []
+
+        @with_retry(retry_config=no_delay_config(2))
+        def invalid():
+            attempts.append(1)
+            raise MemoryError("out of memory")
+
+        with pytest.raises(MemoryError):
+            invalid()
+
+        assert len(attempts) == 1
+
+    @pytest.mark.asyncio
+    async def test_async_function(self):
+        """Coroutine functions are awaited through execute_with_retry"""
+        @with_retry(retry_config=no_delay_config(1))
+        async def succeed(value):
+            return value * 2
+
+        assert await succeed(21) == 42
+
+
+class TestCircuitBreakerRegistry:
+    """Test cases for ErrorHandler.get_circuit_breaker."""
+
+    def test_least_recently_used_breaker_evicted(self):
+        """The registry is bounded and keeps recently used breakers"""
+        handler = ErrorHandler()
+        handler.max_circuit_breakers = 3
+
+        first = handler.get_circuit_breaker("a", ErrorCategory.NETWORK)
+        handler.get_circuit_breaker("b", ErrorCategory.NETWORK)
+        handler.get_circuit_breaker("c", ErrorCategory.NETWORK)
+        assert handler.get_circuit_breaker("a", ErrorCategory.NETWORK) is first
+
+        handler.get_circuit_breaker("d", ErrorCategory.NETWORK)
+
+        assert list(handler.circuit_breakers) == ["c", "a", "d"]
+
+
+class TestGracefulDegradation:
+    """Test cases for the handle_graceful_degradation decorator."""
+
+    @pytest.mark.asyncio
+    async def test_async_fallback(self):
+        """Async functions fall back to an awaited async fallback"""
+        async def fallback(value):
+            return f"fallback {value}"
+
+        @handle_graceful_degradation(fallback_func=fallback, log_fallback=False)
+        async def fail(value):
+            raise ConnectionError("down")
+
+        assert await fail(1) == "fallback 1"
+
+    def test_sync_fallback_value(self):
+        """Sync functions return the static fallback value"""
+        @handle_graceful_degradation(fallback_value=[], log_fallback=False)
+        def fail():
+            raise ConnectionError("down")
+
+        assert fail() == []
+
+    def test_async_fallback_rejected_for_sync_function(self):
+        """An async fallback on a sync function fails at decoration time"""
+        async def fallback():
+            return None
+
+        with pytest.raises(TypeError):
+            @handle_graceful_degradation(fallback_func=fallback)
+            def sync_func():
+                return None
@@ -0,0 +1,390 @@
+"""
+Unit tests for the health monitoring system.
+
+Covers metrics history, summaries and health check bookkeeping.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+
+import psutil
+import pytest
+from datetime import datetime
+
+from utils.health_monitor import (
+    HealthMonitor, HealthStatus, MetricsRing, ServiceHealth, SystemMetrics
+)
+
+
+def make_metrics(cpu: float, minutes_ago: float = 0.0) -> SystemMetrics:
+    """Build a metrics sample with the given CPU usage and age"""
+    return SystemMetrics(
+        timestamp=time.time() - minutes_ago * 60,
+        cpu_percent=cpu,
+        memory_percent=cpu / 2,
+        disk_usage_percent=50.0
+    )
+
+
+class TestMetricsRing:
+    """Test cases for the MetricsRing buffer."""
+
+    def test_ordered_before_wraparound(self):
+        """Samples come back in insertion order"""
+        ring = MetricsRing(4)
+        for cpu in (1.0, 2.0, 3.0):
+            ring.append(make_metrics(cpu))
+
+        assert len(ring) == 3
+        assert list(ring.ordered()["cpu"]) == [1.0, 2.0, 3.0]
+
+    def test_oldest_overwritten_when_full(self):
+        """Appending past capacity drops the oldest samples"""
+        ring = MetricsRing(3)
+        for cpu in (1.0, 2.0, 3.0, 4.0, 5.0):
+            ring.append(make_metrics(cpu))
+
+        assert len(ring) == 3
+        assert list(ring.ordered()["cpu"]) == [3.0, 4.0, 5.0]
+
+    def test_view_since_cutoff(self):
+        """A view holds only samples at or after the cutoff, across the wrap point"""
+        ring = MetricsRing(3)
+        for cpu, minutes_ago in ((1.0, 40), (2.0, 30), (3.0, 20), (4.0, 10)):
+            ring.append(make_metrics(cpu, minutes_ago=minutes_ago))
+
+        assert list(ring.view("cpu", since=time.time() - 25 * 60)) == [3.0, 4.0]
+        assert len(ring.view("cpu", since=time.time())) == 0
+        assert list(ring.view("cpu", since=0.0)) == [2.0, 3.0, 4.0]
+
+
+class TestSystemMetrics:
+    """Test cases for HealthMonitor.collect_system_metrics."""
+
+    def test_collects_process_metrics(self):
+        """A sample reports real process and disk figures"""
+        metrics = HealthMonitor().collect_system_metrics()
+
+        assert metrics.process_count > 0
+        assert metrics.disk_free_gb > 0
+
+    def test_disk_usage_cached(self, monkeypatch):
+        """Disk usage is read once per cache window"""
+        monitor = HealthMonitor()
+        calls = []
+        real_disk_usage = psutil.disk_usage
+        monkeypatch.setattr(psutil, "disk_usage", lambda path: calls.append(path) or real_disk_usage(path))
+
+        monitor.collect_system_metrics()
+        monitor.collect_system_metrics()
+        assert len(calls) == 1
+
+        monitor.disk_cache_seconds = 0.0
+        monitor.collect_system_metrics()
+        assert len(calls) == 2
+
+
+class TestMetricsSummary:
+    """Test cases for HealthMonitor.get_metrics_summary."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.monitor = HealthMonitor()
+
+    def test_no_data(self):
+        """An empty history reports an error"""
+        assert "error" in self.monitor.get_metrics_summary()
+
+    def test_summary_statistics(self):
+        """Statistics cover only samples inside the window"""
+        self.monitor.metrics_ring.append(make_metrics(90.0, minutes_ago=120))
+        for cpu in (10.0, 20.0, 30.0):
+            self.monitor.metrics_ring.append(make_metrics(cpu))
+
+        summary = self.monitor.get_metrics_summary(hours=1)
+
+        assert summary["data_points"] == 3
+        assert summary["cpu"] == {"current": 30.0, "average": 20.0, "max": 30.0, "min": 10.0}
+        assert summary["memory"]["max"] == 15.0
+        assert summary["disk"]["average"] == 50.0
+
+    def test_window_without_samples(self):
+        """A window with no recent samples reports an error"""
+        self.monitor.metrics_ring.append(make_metrics(50.0, minutes_ago=120))
+
+        assert "error" in self.monitor.get_metrics_summary(hours=1)
+
+
+class TestAlertRateLimiting:
+    """Test cases for repeated alert suppression."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.monitor = HealthMonitor()
+
+    def test_repeated_alerts_suppressed(self, caplog):
+        """The same alert is logged once per interval"""
+        metrics = make_metrics(99.0)
+        with caplog.at_level(logging.WARNING, logger="utils.health_monitor"):
+            for _ in range(5):
+                self.monitor.check_system_alerts(metrics)
+
+        cpu_alerts = [r for r in caplog.records if r.getMessage().startswith("High CPU")]
+        assert len(cpu_alerts) == 1
+        assert self.monitor._suppressed_alerts["high_cpu"] == 4
+
+    def test_alert_severity_and_thresholds(self, caplog):
+        """Each breached threshold alerts once, critical above the hard limit"""
+        self.monitor.disk_threshold = 40.0
+        metrics = make_metrics(96.0)  # memory at 48%, disk at 50%
+        with caplog.at_level(logging.WARNING, logger="utils.health_monitor"):
+            self.monitor.check_system_alerts(metrics)
+
+        alerts = {r.type: r for r in caplog.records}
+        assert set(alerts) == {"high_cpu", "high_disk"}
+        assert alerts["high_cpu"].levelno == logging.CRITICAL
+        assert alerts["high_disk"].levelno == logging.WARNING
+        assert alerts["high_disk"].threshold == 40.0
+        assert alerts["high_cpu"].getMessage() == "High CPU usage: 96.0%"
+
+    def test_summary_after_window(self, caplog):
+        """The suppressed count is reported when the window expires"""
+        assert self.monitor._should_emit("key", min_interval=0.05)
+        assert not self.monitor._should_emit("key", min_interval=0.05)
+        time.sleep(0.06)
+
+        with caplog.at_level(logging.INFO, logger="utils.health_monitor"):
+            assert self.monitor._should_emit("key", min_interval=0.05)
+
+        assert any("Suppressed 1 repeated 'key'" in r.getMessage() for r in caplog.records)
+        assert "key" not in self.monitor._suppressed_alerts
+
+
+class TestRunHealthCheck:
+    """Test cases for HealthMonitor.run_health_check."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.monitor = HealthMonitor()
+
+    @pytest.mark.asyncio
+    async def test_failures_counted_and_reset(self):
+        """Consecutive failures grow on errors and reset once healthy"""
+        outcomes = [RuntimeError("down"), False, True]
+
+        async def flaky():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        self.monitor.register_health_check("flaky", flaky)
+        check = self.monitor.health_checks["flaky"]
+
+        first = await self.monitor.run_health_check(check)
+        assert first.status == HealthStatus.UNHEALTHY
+        assert first.error_message == "down"
+        assert check.consecutive_failures == 1
+
+        second = await self.monitor.run_health_check(check)
+        assert second.error_message == "Health check returned False"
+        assert check.consecutive_failures == 2
+
+        third = await self.monitor.run_health_check(check)
+        assert third.status == HealthStatus.HEALTHY
+        assert check.consecutive_failures == 0
+        assert check.last_error is None
+        assert check.last_check == third.last_check
+
+    @pytest.mark.asyncio
+    async def test_sync_check_runs_in_executor(self):
+        """Plain functions are run off the event loop thread"""
+        loop_thread = threading.get_ident()
+        seen = []
+
+        def blocking_check():
+            seen.append(threading.get_ident())
+            return {"status": "degraded"}
+
+        self.monitor.register_health_check("sync", blocking_check)
+        result = await self.monitor.run_health_check(self.monitor.health_checks["sync"])
+
+        assert result.status == HealthStatus.DEGRADED
+        assert seen and seen[0] != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_wrapped_async_checks_are_awaited(self):
+        """Partials of async functions and lambdas returning coroutines are awaited"""
+        async def check(status):
+            return {"status": status}
+
+        self.monitor.register_health_check("partial", functools.partial(check, "degraded"))
+        self.monitor.register_health_check("lambda", lambda: check("unhealthy"))
+
+        partial_result = await self.monitor.run_health_check(self.monitor.health_checks["partial"])
+        lambda_result = await self.monitor.run_health_check(self.monitor.health_checks["lambda"])
+
+        assert partial_result.status == HealthStatus.DEGRADED
+        assert lambda_result.status == HealthStatus.UNHEALTHY
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Checks exceeding their timeout are unhealthy"""
+        async def hangs():
+            await asyncio.sleep(1)
+
+        self.monitor.register_health_check("hangs", hangs, timeout_seconds=0.01)
+        check = self.monitor.health_checks["hangs"]
+
+        result = await self.monitor.run_health_check(check)
+        assert result.status == HealthStatus.UNHEALTHY
+        assert "timed out" in result.error_message
+        assert check.last_status == HealthStatus.UNHEALTHY
+
+
+class TestOverallHealth:
+    """Test cases for HealthMonitor.get_overall_health."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.monitor = HealthMonitor()
+
+    def record(self, name: str, status: HealthStatus):
+        """Record a result for a named check"""
+        if name not in self.monitor.health_checks:
+            self.monitor.register_health_check(name, lambda: None)
+        check = self.monitor.health_checks[name]
+        self.monitor._record_result(
+            check, ServiceHealth(name=name, status=status, last_check=time.time())
+        )
+
+    def test_most_severe_status_wins(self):
+        """Overall status is the worst service status"""
+        self.record("a", HealthStatus.HEALTHY)
+        self.record("b", HealthStatus.DEGRADED)
+        assert self.monitor.get_overall_health()["status"] == "degraded"
+
+        self.record("c", HealthStatus.CRITICAL)
+        assert self.monitor.get_overall_health()["status"] == "critical"
+
+    def test_counts_follow_replaced_results(self):
+        """A new result for a service replaces its previous status in the counts"""
+        self.record("a", HealthStatus.UNHEALTHY)
+        self.record("b", HealthStatus.HEALTHY)
+        self.record("a", HealthStatus.HEALTHY)
+
+        health = self.monitor.get_overall_health()
+        assert health["status"] == "healthy"
+        assert health["service_counts"] == {"healthy": 2}
+
+    def test_report_cached_until_next_result(self):
+        """Reports are reused briefly and rebuilt when a result arrives"""
+        self.record("a", HealthStatus.HEALTHY)
+        first = self.monitor.get_overall_health()
+        first["environment"] = {}
+
+        second = self.monitor.get_overall_health()
+        assert second["timestamp"] == first["timestamp"]
+        assert "environment" not in second
+
+        self.record("a", HealthStatus.DEGRADED)
+        assert self.monitor.get_overall_health()["status"] == "degraded"
+
+    def test_disabled_and_removed_checks_dropped(self):
+        """Results for checks that are gone or disabled no longer count"""
+        self.monitor.overall_cache_seconds = 0.0
+        self.record("a", HealthStatus.HEALTHY)
+        self.record("b", HealthStatus.CRITICAL)
+        self.record("c", HealthStatus.UNHEALTHY)
+
+        self.monitor.health_checks["b"].enabled = False
+        del self.monitor.health_checks["c"]
+
+        health = self.monitor.get_overall_health()
+        assert health["status"] == "healthy"
+        assert set(health["services"]) == {"a"}
+        assert health["service_counts"] == {"healthy": 1}
+
+    def test_timestamps_formatted_as_iso(self):
+        """Epoch timestamps are rendered as ISO strings in the report"""
+        self.record("a", HealthStatus.HEALTHY)
+        self.monitor.latest_metrics = make_metrics(10.0)
+
+        health = self.monitor.get_overall_health()
+        last_check = self.monitor.service_health["a"].last_check
+        assert health["services"]["a"]["last_check"] == datetime.utcfromtimestamp(last_check).isoformat()
+        assert isinstance(health["system_metrics"]["timestamp"], str)
+
+
+class TestScheduling:
+    """Test cases for self-rescheduling health checks."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.monitor = HealthMonitor()
+        self.monitor.metrics_interval_seconds = 60.0
+
+    @pytest.mark.asyncio
+    async def test_checks_run_on_their_own_interval(self):
+        """Each check reruns on its own interval until monitoring stops"""
+        fast_runs = []
+        slow_runs = []
+
+        async def fast_check():
+            fast_runs.append(1)
+            return True
+
+        async def slow_check():
+            slow_runs.append(1)
+            return True
+
+        self.monitor.register_health_check("fast", fast_check, interval_seconds=0.02)
+        self.monitor.register_health_check("slow", slow_check, interval_seconds=60.0)
+
+        await self.monitor.start_monitoring()
+        await asyncio.sleep(0.15)
+        await self.monitor.stop_monitoring()
+
+        assert len(fast_runs) >= 3
+        assert len(slow_runs) == 1
+        assert self.monitor.service_health["fast"].status == HealthStatus.HEALTHY
+
+        # Nothing runs once monitoring has stopped
+        runs_at_stop = len(fast_runs)
+        await asyncio.sleep(0.05)
+        assert len(fast_runs) == runs_at_stop
+
+    @pytest.mark.asyncio
+    async def test_check_registered_while_running(self):
+        """Checks registered after startup run straight away"""
+        async def late_check():
+            return {"status": "degraded"}
+
+        await self.monitor.start_monitoring()
+        self.monitor.register_health_check("late", late_check, interval_seconds=60.0)
+        await asyncio.sleep(0.02)
+        await self.monitor.stop_monitoring()
+
+        assert self.monitor.service_health["late"].status == HealthStatus.DEGRADED
+
+    @pytest.mark.asyncio
+    async def test_run_health_checks_concurrently(self):
+        """Batched checks overlap instead of running one after another"""
+        async def slow_check():
+            await asyncio.sleep(0.1)
+            return True
+
+        for name in ("a", "b", "c"):
+            self.monitor.register_health_check(name, slow_check)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await self.monitor.run_health_checks()
+        elapsed = loop.time() - start
+
+        assert set(results) == {"a", "b", "c"}
+        assert set(self.monitor.service_health) == {"a", "b", "c"}
+        assert elapsed < 0.25
@@ -0,0 +1,270 @@
+"""
+Unit tests for the logging configuration.
+
+Covers JSON formatting of log records and the queued handler setup.
+"""
+
+import json
+import logging
+import logging.handlers
+import sys
+import threading
+
+import pytest
+
+from utils.logging_config import (
+    ErrorTracker, JSONFormatter, LocalQueueHandler, PerformanceLogger, setup_logging, stop_logging
+)
+
+
+def make_record(msg: str = "hello %s", args=("world",), level: int = logging.INFO, exc_info=None, **extra) -> logging.LogRecord:
+    """Build a log record with optional extra attributes"""
+    record = logging.LogRecord("test", level, __file__, 10, msg, args, exc_info)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJSONFormatter:
+    """Test cases for JSONFormatter."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.formatter = JSONFormatter()
+
+    def test_base_fields(self):
+        """Base fields are always present"""
+        entry = json.loads(self.formatter.format(make_record()))
+
+        assert entry["message"] == "hello world"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "test"
+        assert entry["line"] == 10
+        assert "T" in entry["timestamp"]
+
+    def test_extra_fields(self):
+        """Known extra fields are copied, unknown and None ones are not"""
+        record = make_record(error_id="err_1", retry_count=2, client_id=None, other="x")
+        entry = json.loads(self.formatter.format(record))
+
+        assert entry["error_id"] == "err_1"
+        assert entry["retry_count"] == 2
+        assert "client_id" not in entry
+        assert "other" not in entry
+
+    def test_extra_fields_keep_declared_order(self):
+        """Extra fields are emitted in a stable order"""
+        record = make_record(request_id="r1", error_id="e1", category="db")
+        entry = json.loads(self.formatter.format(record))
+
+        assert list(entry)[-3:] == ["error_id", "category", "request_id"]
+
+    def test_non_json_values_fall_back_to_str(self):
+        """Values orjson cannot serialize are stringified"""
+        class Marker:
+            def __str__(self):
+                return "marker"
+
+        entry = json.loads(self.formatter.format(make_record(category=Marker())))
+        assert entry["category"] == "marker"
+
+    def test_exception_info(self):
+        """Exception tracebacks are included"""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(level=logging.ERROR, exc_info=sys.exc_info())
+
+        entry = json.loads(self.formatter.format(record))
+        assert "ValueError: boom" in entry["exception"]
+
+    def test_exception_formatted_once(self, monkeypatch):
+        """The traceback text is cached on the record for later handlers"""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(level=logging.ERROR, exc_info=sys.exc_info())
+
+        calls = []
+        real_format_exception = self.formatter.formatException
+        monkeypatch.setattr(
+            self.formatter, "formatException", lambda ei: calls.append(ei) or real_format_exception(ei)
+        )
+
+        first = self.formatter.format(record)
+        second = JSONFormatter().format(record)
+        assert len(calls) == 1
+        assert json.loads(first)["exception"] == json.loads(second)["exception"]
+
+
+class TestPerformanceLogger:
+    """Test cases for PerformanceLogger."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.perf = PerformanceLogger("test.performance")
+
+    def test_timed_logs_duration(self, caplog):
+        """timed() logs the block's duration"""
+        with caplog.at_level(logging.DEBUG, logger="test.performance"):
+            with self.perf.timed("op", {"items": 3}):
+                pass
+
+        record = caplog.records[-1]
+        assert record.operation_id == "op"
+        assert record.items == 3
+        assert 0 <= record.duration_seconds < 1
+
+    def test_timed_logs_on_exception(self, caplog):
+        """The duration is still logged when the block raises"""
+        with caplog.at_level(logging.DEBUG, logger="test.performance"):
+            with pytest.raises(ValueError):
+                with self.perf.timed("failing"):
+                    raise ValueError("boom")
+
+        assert caplog.records[-1].operation_id == "failing"
+
+    def test_start_end_timer(self, caplog):
+        """The legacy timer pair still works and cleans up"""
+        with caplog.at_level(logging.DEBUG, logger="test.performance"):
+            self.perf.start_timer("legacy")
+            self.perf.end_timer("legacy")
+            self.perf.end_timer("legacy")
+
+        assert caplog.records[-2].operation_id == "legacy"
+        assert "was not started" in caplog.records[-1].getMessage()
+        assert self.perf.start_times == {}
+
+
+class TestErrorTracker:
+    """Test cases for ErrorTracker."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.tracker = ErrorTracker("test.error_tracker")
+
+    def test_counts_escalate(self, caplog):
+        """Repeated errors are counted and logged at rising levels"""
+        with caplog.at_level(logging.DEBUG, logger="test.error_tracker"):
+            for _ in range(5):
+                self.tracker.track_error("db", "connection refused")
+
+        assert [r.levelno for r in caplog.records] == [
+            logging.INFO, logging.WARNING, logging.WARNING, logging.WARNING, logging.ERROR
+        ]
+        summary = self.tracker.get_error_summary()
+        assert summary["error_counts"] == {"db": 5}
+        assert summary["total_errors"] == 5
+
+    def test_window_reset(self):
+        """Counts start over once the reset interval has elapsed"""
+        self.tracker.track_error("db", "connection refused")
+        self.tracker._window_start -= self.tracker.reset_interval + 1
+        self.tracker.track_error("api", "timeout")
+
+        assert self.tracker.get_error_summary()["error_counts"] == {"api": 1}
+
+    def test_concurrent_tracking(self):
+        """Counts from many threads are not lost"""
+        logging.getLogger("test.error_tracker").setLevel(logging.CRITICAL + 1)
+
+        def worker():
+            for _ in range(200):
+                self.tracker.track_error("race", "x")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert self.tracker.get_error_summary()["error_counts"] == {"race": 800}
+
+
+@pytest.fixture
+def configured_logging(tmp_path):
+    """Run setup_logging into a temporary directory and restore the root logger afterwards"""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    perf = logging.getLogger("performance")
+    saved_perf_handlers = perf.handlers[:]
+
+    loggers = setup_logging(log_dir=str(tmp_path))
+    yield tmp_path, loggers
+
+    stop_logging()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+    perf.handlers[:] = saved_perf_handlers
+
+
+def read_entries(path):
+    """Parse a JSON-lines log file"""
+    return [json.loads(line) for line in path.read_text().splitlines() if line]
+
+
+class TestQueuedLogging:
+    """Test cases for the queue-based handler setup."""
+
+    def test_loggers_only_enqueue(self, configured_logging):
+        """Root and performance loggers hold queue handlers only"""
+        _, loggers = configured_logging
+
+        root_handlers = logging.getLogger().handlers
+        assert any(isinstance(h, LocalQueueHandler) for h in root_handlers)
+        assert not any(isinstance(h, logging.handlers.RotatingFileHandler) for h in root_handlers)
+        perf_handlers = logging.getLogger("performance").handlers
+        assert any(isinstance(h, LocalQueueHandler) for h in perf_handlers)
+        assert not any(isinstance(h, logging.handlers.RotatingFileHandler) for h in perf_handlers)
+        assert len(loggers["listeners"]) == 2
+
+    def test_records_reach_files_after_stop(self, configured_logging):
+        """Stopping the listeners flushes queued records to their files"""
+        log_dir, _ = configured_logging
+
+        logging.getLogger("app").info("queued %d", 1)
+        try:
+            raise RuntimeError("bad")
+        except RuntimeError:
+            logging.getLogger("app").error("failed", exc_info=True)
+        logging.getLogger("performance").info("perf only")
+        stop_logging()
+
+        app_entries = read_entries(log_dir / "app.log")
+        messages = [entry["message"] for entry in app_entries]
+        assert "queued 1" in messages
+        assert "perf only" not in messages
+        assert "RuntimeError: bad" in app_entries[-1]["exception"]
+
+        assert [e["message"] for e in read_entries(log_dir / "error.log")] == ["failed"]
+        assert [e["message"] for e in read_entries(log_dir / "performance.log")] == ["perf only"]
+
+    def test_records_after_stop_are_written(self, configured_logging):
+        """After stopping, loggers write directly instead of to an undrained queue"""
+        log_dir, _ = configured_logging
+        stop_logging()
+
+        root_handlers = logging.getLogger().handlers
+        assert not any(isinstance(h, LocalQueueHandler) for h in root_handlers)
+        assert not any(isinstance(h, LocalQueueHandler) for h in logging.getLogger("performance").handlers)
+
+        logging.getLogger("app").error("late shutdown message")
+        logging.getLogger("performance").info("late perf")
+        for handler in logging.getLogger("performance").handlers:
+            handler.flush()
+
+        assert [e["message"] for e in read_entries(log_dir / "error.log")] == ["late shutdown message"]
+        assert [e["message"] for e in read_entries(log_dir / "performance.log")] == ["late perf"]
+
+    def test_file_writes_batched_until_error(self, configured_logging):
+        """Routine records are buffered, and an error flushes them"""
+        log_dir, loggers = configured_logging
+        app_log = log_dir / "app.log"
+        root_listener = loggers["listeners"][-1]
+
+        logging.getLogger("app").info("buffered")
+        root_listener.queue.join()
+        assert "buffered" not in app_log.read_text()
+
+        logging.getLogger("app").error("flush now")
+        root_listener.queue.join()
+        assert [e["message"] for e in read_entries(app_log)][-2:] == ["buffered", "flush now"]
@@ -20,9 +20,12 @@ class MockWebSocket:
     """Mock WebSocket for testing"""
     
     def __init__(self):
+        # Raw UTF-8 frames; decoded lazily through parsed()
         self.messages_sent = []
+        self._parsed_cache = {}
         self.closed = False
         self.should_fail = False
+        self.ping_delay = 0.0
         
     async def accept(self):
         """Mock accept method"""
@@ -32,7 +35,17 @@ class MockWebSocket:
         """Mock send_text method"""
         if self.should_fail:
             raise Exception("Mock WebSocket send failure")
-        self.messages_sent.append(data)
+        self.messages_sent.append(memoryview(data.encode()))
+    
+    def parsed(self, index: int):
+        """Return the JSON-decoded frame at index, decoding it only once"""
+        frame = self.messages_sent[index]
+        cached = self._parsed_cache.get(index)
+        if cached is not None and cached[0] is frame:
+            return cached[1]
+        value = json.loads(frame.tobytes())
+        self._parsed_cache[index] = (frame, value)
+        return value
     
     async def receive_text(self):
         """Mock receive_text method"""
@@ -43,6 +56,8 @@ class MockWebSocket:
     
     async def ping(self):
         """Mock ping method"""
+        if self.ping_delay:
+            await asyncio.sleep(self.ping_delay)
         if self.should_fail:
             raise Exception("Mock WebSocket ping failure")
         pass
@@ -55,11 +70,9 @@ class MockWebSocket:
 @pytest.fixture
 def connection_manager():
     """Create a fresh ConnectionManager for each test"""
-    # Create a new connection manager for each test to avoid asyncio loop issues
-    manager = ConnectionManager()
-    # Reset the lock to the current event loop
-    manager._lock = asyncio.Lock()
-    return manager
+    # Per-test instance so tests never share state.
+    # asyncio.Lock binds to the running loop lazily, so no reset is needed.
+    return ConnectionManager()
 
 
 @pytest.fixture
@@ -109,7 +122,7 @@ async def test_connection_manager_connect(connection_manager, mock_websocket):
     
     # Verify connection message was sent
     assert len(mock_websocket.messages_sent) == 1
-    message_data = json.loads(mock_websocket.messages_sent[0])
+    message_data = mock_websocket.parsed(0)
     assert message_data["message"]["type"] == "connection"
     assert message_data["message"]["status"] == "connected"
     assert message_data["message"]["client_id"] == client_id
@@ -158,7 +171,7 @@ async def test_send_personal_message(connection_manager, mock_websocket, sample_
     
     # Verify message was sent
     assert len(mock_websocket.messages_sent) == 1
-    message_data = json.loads(mock_websocket.messages_sent[0])
+    message_data = mock_websocket.parsed(0)
     assert message_data["message"]["type"] == "upsert_nodes"
     assert len(message_data["message"]["nodes"]) == 1
     assert message_data["message"]["nodes"][0]["id"] == "test_entity_1"
@@ -233,7 +246,7 @@ async def test_broadcast_message(connection_manager, sample_relationship):
     
     # Verify message content
     for ws in [mock_ws1, mock_ws2, mock_ws3]:
-        message_data = json.loads(ws.messages_sent[0])
+        message_data = ws.parsed(0)
         assert message_data["message"]["type"] == "upsert_edges"
         assert len(message_data["message"]["edges"]) == 1
 
@@ -280,7 +293,7 @@ async def test_handle_client_message(connection_manager, mock_websocket):
     
     # Verify error message was sent
     assert len(mock_websocket.messages_sent) == 1
-    error_data = json.loads(mock_websocket.messages_sent[0])
+    error_data = mock_websocket.parsed(0)
     assert error_data["message"]["type"] == "error"
     assert error_data["message"]["error"] == "invalid_json"
 
@@ -339,6 +352,31 @@ async def test_cleanup_stale_connections(connection_manager):
     assert client2 not in connection_manager.active_connections
 
 
+@pytest.mark.asyncio
+async def test_cleanup_stale_connections_with_slow_ping(connection_manager):
+    """Test cleanup when pings take real time to complete"""
+    mock_ws1 = MockWebSocket()
+    mock_ws2 = MockWebSocket()
+    
+    client1 = await connection_manager.connect(mock_ws1)
+    client2 = await connection_manager.connect(mock_ws2)
+    
+    # Simulate slow keepalive round-trips
+    mock_ws1.ping_delay = 0.05
+    mock_ws2.ping_delay = 0.05
+    mock_ws2.should_fail = True
+    
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await connection_manager.cleanup_stale_connections()
+    
+    # Pings run sequentially, so cleanup waits for both delays (less a little
+    # slack for timer granularity)
+    assert loop.time() - start >= 0.09
+    assert client1 in connection_manager.active_connections
+    assert client2 not in connection_manager.active_connections
+
+
 @pytest.mark.asyncio
 async def test_message_queue_size_limit(connection_manager, sample_entity):
     """Test that message queues have size limits"""
@@ -10,17 +10,45 @@ This module provides:
 
 import asyncio
 import logging
+import os
 import time
 import random
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+import secrets
+import threading
+import weakref
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Literal, Optional, Tuple, Type, Union
 from enum import Enum
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from functools import wraps
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
 import traceback
 
 logger = logging.getLogger(__name__)
 
+JitterMode = Literal["none", "equal", "full", "decorrelated"]
+
+# Private random generators, reseeded in forked workers so each process
+# produces its own jitter sequence
+_rngs: "weakref.WeakSet[random.Random]" = weakref.WeakSet()
+
+
+def _new_rng() -> random.Random:
+    """Create an independent random generator seeded from os.urandom"""
+    rng = random.Random(os.urandom(8))
+    _rngs.add(rng)
+    return rng
+
+
+def _reseed_rngs():
+    for rng in list(_rngs):
+        rng.seed(os.urandom(8))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_rngs)
+
 
 class ErrorSeverity(Enum):
     """Error severity levels"""
@@ -41,7 +69,29 @@ class ErrorCategory(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Keyword -> classification, in priority order; the first keyword found in
+# the lowercased exception type name wins.
+_KEYWORD_TABLE = tuple(
+    (keyword, category, severity, recoverable)
+    for keywords, category, severity, recoverable in (
+        (('connection', 'timeout', 'network', 'http'),
+         ErrorCategory.NETWORK, ErrorSeverity.MEDIUM, True),
+        (('database', 'qdrant', 'oxigraph', 'storage'),
+         ErrorCategory.DATABASE, ErrorSeverity.HIGH, True),
+        (('openai', 'api', 'rate', 'quota'),
+         ErrorCategory.LLM_API, ErrorSeverity.HIGH, True),
+        (('validation', 'pydantic', 'json'),
+         ErrorCategory.VALIDATION, ErrorSeverity.LOW, False),
+        (('processing', 'extraction', 'canonicalization'),
+         ErrorCategory.PROCESSING, ErrorSeverity.MEDIUM, True),
+        (('memory', 'disk', 'permission', 'system'),
+         ErrorCategory.SYSTEM, ErrorSeverity.CRITICAL, False),
+    )
+    for keyword in keywords
+)
+
+
+@dataclass(slots=True)
 class ErrorInfo:
     """Structured error information"""
     error_id: str
@@ -49,11 +99,26 @@ class ErrorInfo:
     severity: ErrorSeverity
     message: str
     details: Dict[str, Any] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp_epoch: float = field(default_factory=time.time)
     traceback: Optional[str] = None
     context: Dict[str, Any] = field(default_factory=dict)
     retry_count: int = 0
     recoverable: bool = True
+    _exc: Optional[BaseException] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """UTC time the error was recorded, built on demand from the epoch value"""
+        return datetime.fromtimestamp(self.timestamp_epoch, tz=timezone.utc)
+    
+    def get_traceback(self) -> Optional[str]:
+        """Format the traceback on first use instead of at classification time"""
+        if self.traceback is None and self._exc is not None:
+            exc = self._exc
+            self.traceback = "".join(
+                traceback.format_exception(type(exc), exc, exc.__traceback__)
+            )
+        return self.traceback
 
 
 class CircuitBreakerState(Enum):
@@ -63,7 +128,7 @@ class CircuitBreakerState(Enum):
     HALF_OPEN = "half_open"  # Testing if service recovered
 
 
-@dataclass
+@dataclass(slots=True)
 class CircuitBreakerConfig:
     """Circuit breaker configuration"""
     failure_threshold: int = 5
@@ -75,6 +140,11 @@ class CircuitBreakerConfig:
 class CircuitBreaker:
     """Circuit breaker implementation for external service calls"""
     
+    __slots__ = (
+        "name", "config", "state", "failure_count", "success_count",
+        "last_failure_time", "next_attempt_time", "_lock"
+    )
+    
     def __init__(self, name: str, config: CircuitBreakerConfig):
         self.name = name
         self.config = config
@@ -83,65 +153,92 @@ class CircuitBreaker:
         self.success_count = 0
         self.last_failure_time = None
         self.next_attempt_time = None
+        # Guards state transitions against concurrent updates from threads
+        self._lock = threading.Lock()
         
-    def can_execute(self) -> bool:
+    def can_execute(self, now: Optional[float] = None) -> bool:
         """Check if execution is allowed based on circuit breaker state"""
-        now = time.time()
-        
-        if self.state == CircuitBreakerState.CLOSED:
-            return True
-        elif self.state == CircuitBreakerState.OPEN:
-            if self.next_attempt_time and now >= self.next_attempt_time:
-                self.state = CircuitBreakerState.HALF_OPEN
-                self.success_count = 0
-                logger.info(f"Circuit breaker {self.name} transitioning to HALF_OPEN")
+        if now is None:
+            now = time.monotonic()
+        
+        with self._lock:
+            if self.state == CircuitBreakerState.CLOSED:
+                return True
+            elif self.state == CircuitBreakerState.OPEN:
+                if self.next_attempt_time and now >= self.next_attempt_time:
+                    self.state = CircuitBreakerState.HALF_OPEN
+                    self.success_count = 0
+                    logger.info(f"Circuit breaker {self.name} transitioning to HALF_OPEN")
+                    return True
+                return False
+            elif self.state == CircuitBreakerState.HALF_OPEN:
                 return True
+            
             return False
-        elif self.state == CircuitBreakerState.HALF_OPEN:
-            return True
-        
-        return False
     
     def record_success(self):
         """Record a successful execution"""
-        if self.state == CircuitBreakerState.HALF_OPEN:
-            self.success_count += 1
-            if self.success_count >= self.config.success_threshold:
-                self.state = CircuitBreakerState.CLOSED
-                self.failure_count = 0
-                logger.info(f"Circuit breaker {self.name} transitioning to CLOSED")
-        elif self.state == CircuitBreakerState.CLOSED:
-            self.failure_count = max(0, self.failure_count - 1)
+        with self._lock:
+            if self.state == CircuitBreakerState.HALF_OPEN:
+                self.success_count += 1
+                if self.success_count >= self.config.success_threshold:
+                    self.state = CircuitBreakerState.CLOSED
+                    self.failure_count = 0
+                    logger.info(f"Circuit breaker {self.name} transitioning to CLOSED")
+            elif self.state == CircuitBreakerState.CLOSED:
+                self.failure_count = max(0, self.failure_count - 1)
     
-    def record_failure(self):
+    def record_failure(self, now: Optional[float] = None):
         """Record a failed execution"""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
+        if now is None:
+            now = time.monotonic()
         
-        if self.state == CircuitBreakerState.CLOSED:
-            if self.failure_count >= self.config.failure_threshold:
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = now
+            
+            if self.state == CircuitBreakerState.CLOSED:
+                if self.failure_count >= self.config.failure_threshold:
+                    self.state = CircuitBreakerState.OPEN
+                    self.next_attempt_time = now + self.config.recovery_timeout
+                    logger.warning(f"Circuit breaker {self.name} transitioning to OPEN")
+            elif self.state == CircuitBreakerState.HALF_OPEN:
                 self.state = CircuitBreakerState.OPEN
-                self.next_attempt_time = time.time() + self.config.recovery_timeout
-                logger.warning(f"Circuit breaker {self.name} transitioning to OPEN")
-        elif self.state == CircuitBreakerState.HALF_OPEN:
-            self.state = CircuitBreakerState.OPEN
-            self.next_attempt_time = time.time() + self.config.recovery_timeout
-            logger.warning(f"Circuit breaker {self.name} transitioning back to OPEN")
+                self.next_attempt_time = now + self.config.recovery_timeout
+                logger.warning(f"Circuit breaker {self.name} transitioning back to OPEN")
     
     def get_status(self) -> Dict[str, Any]:
         """Get current circuit breaker status"""
+        # State transitions run on the monotonic clock; report epoch seconds
+        offset = time.time() - time.monotonic()
         return {
             "name": self.name,
             "state": self.state.value,
             "failure_count": self.failure_count,
             "success_count": self.success_count,
-            "last_failure_time": self.last_failure_time,
-            "next_attempt_time": self.next_attempt_time
+            "last_failure_time": None if self.last_failure_time is None else self.last_failure_time + offset,
+            "next_attempt_time": None if self.next_attempt_time is None else self.next_attempt_time + offset
         }
 
 
 class RetryConfig:
-    """Configuration for retry logic with exponential backoff"""
+    """
+    Configuration for retry logic with exponential backoff
+    
+    Jitter modes (see the AWS "Exponential Backoff And Jitter" article):
+    - "none": deterministic exponential delay
+    - "equal": half the exponential delay plus a random half
+    - "full": uniform between 0 and the exponential delay
+    - "decorrelated": uniform between base_delay and 3x the previous delay,
+      capped at max_delay
+    """
+    
+    JITTER_MODES = ("none", "equal", "full", "decorrelated")
+    
+    __slots__ = (
+        "max_retries", "base_delay", "max_delay", "exponential_base", "jitter",
+        "backoff_factor", "jitter_mode", "_rng", "_delays"
+    )
     
     def __init__(
         self,
@@ -150,89 +247,95 @@ class RetryConfig:
         max_delay: float = 60.0,
         exponential_base: float = 2.0,
         jitter: bool = True,
-        backoff_factor: float = 1.0
+        backoff_factor: float = 1.0,
+        jitter_mode: JitterMode = "full"
     ):
+        if jitter_mode not in self.JITTER_MODES:
+            raise ValueError(f"Unknown jitter mode: {jitter_mode}")
+        
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.exponential_base = exponential_base
         self.jitter = jitter
         self.backoff_factor = backoff_factor
+        self.jitter_mode = jitter_mode if jitter else "none"
+        self._rng = _new_rng()
+        # Capped exponential delays for attempts 1..max_retries + 1
+        self._delays = tuple(
+            self._exponential_delay(attempt) for attempt in range(1, max_retries + 2)
+        )
+    
+    def _exponential_delay(self, attempt: int) -> float:
+        """Capped exponential backoff delay, before jitter"""
+        delay = self.base_delay * (self.exponential_base ** (attempt - 1)) * self.backoff_factor
+        return min(delay, self.max_delay)
     
-    def get_delay(self, attempt: int) -> float:
-        """Calculate delay for the given attempt number"""
+    def get_delay(self, attempt: int, prev_delay: Optional[float] = None) -> float:
+        """
+        Calculate delay for the given attempt number
+        
+        prev_delay is the delay the caller used for the previous attempt; only
+        decorrelated jitter reads it. Configs are shared between concurrent
+        retry loops, so that state is kept by the caller rather than here.
+        """
         if attempt <= 0:
             return 0
         
-        # Exponential backoff
-        delay = self.base_delay * (self.exponential_base ** (attempt - 1)) * self.backoff_factor
-        delay = min(delay, self.max_delay)
+        if self.jitter_mode == "decorrelated":
+            prev = self.base_delay if prev_delay is None or attempt == 1 else prev_delay
+            return min(self.max_delay, self._rng.uniform(self.base_delay, prev * 3.0))
         
-        # Add jitter to prevent thundering herd
-        if self.jitter:
-            jitter_amount = delay * 0.1 * random.random()
-            delay += jitter_amount
+        # Exponential backoff, precomputed for the attempts a retry loop makes
+        if attempt <= len(self._delays):
+            delay = self._delays[attempt - 1]
+        else:
+            delay = self._exponential_delay(attempt)
+        
+        # Spread retries out to prevent thundering herd
+        if self.jitter_mode == "full":
+            delay = self._rng.uniform(0, delay)
+        elif self.jitter_mode == "equal":
+            delay = delay / 2 + self._rng.uniform(0, delay / 2)
         
         return delay
 
 
+# Shared configuration for calls that don't supply their own
+_DEFAULT_RETRY_CONFIG = RetryConfig()
+
+
 class ErrorClassifier:
     """Classifies errors into categories and determines recovery strategies"""
     
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _classify_type(error_class: type) -> Tuple[ErrorCategory, ErrorSeverity, bool]:
+        """Classify an exception class by its name (cached per class)"""
+        error_type_lower = error_class.__name__.lower()
+        for keyword, category, severity, recoverable in _KEYWORD_TABLE:
+            if keyword in error_type_lower:
+                return category, severity, recoverable
+        
+        return ErrorCategory.UNKNOWN, ErrorSeverity.MEDIUM, True
+    
     @staticmethod
     def classify_error(error: Exception) -> ErrorInfo:
         """Classify an error and return structured error information"""
-        error_id = f"err_{int(time.time() * 1000)}_{random.randint(1000, 9999)}"
+        error_id = "err_" + secrets.token_hex(8)
         
         # Get error details
         error_type = type(error).__name__
         error_message = str(error)
-        error_traceback = traceback.format_exc()
-        
-        # Classify by error type and message
-        category = ErrorCategory.UNKNOWN
-        severity = ErrorSeverity.MEDIUM
-        recoverable = True
-        
-        # Network-related errors
-        if any(keyword in error_type.lower() for keyword in ['connection', 'timeout', 'network', 'http']):
-            category = ErrorCategory.NETWORK
-            severity = ErrorSeverity.MEDIUM
-            recoverable = True
-        
-        # Database-related errors
-        elif any(keyword in error_type.lower() for keyword in ['database', 'qdrant', 'oxigraph', 'storage']):
-            category = ErrorCategory.DATABASE
-            severity = ErrorSeverity.HIGH
-            recoverable = True
-        
-        # LLM API errors
-        elif any(keyword in error_type.lower() for keyword in ['openai', 'api', 'rate', 'quota']):
-            category = ErrorCategory.LLM_API
-            if 'rate' in error_message.lower() or 'quota' in error_message.lower():
+        
+        # Classify by error type, then refine by message
+        category, severity, recoverable = ErrorClassifier._classify_type(type(error))
+        
+        # Rate limiting and quota errors are expected and less severe
+        if category == ErrorCategory.LLM_API:
+            error_message_lower = error_message.lower()
+            if 'rate' in error_message_lower or 'quota' in error_message_lower:
                 severity = ErrorSeverity.MEDIUM
-                recoverable = True
-            else:
-                severity = ErrorSeverity.HIGH
-                recoverable = True
-        
-        # Validation errors
-        elif any(keyword in error_type.lower() for keyword in ['validation', 'pydantic', 'json']):
-            category = ErrorCategory.VALIDATION
-            severity = ErrorSeverity.LOW
-            recoverable = False
-        
-        # Processing errors
-        elif any(keyword in error_type.lower() for keyword in ['processing', 'extraction', 'canonicalization']):
-            category = ErrorCategory.PROCESSING
-            severity = ErrorSeverity.MEDIUM
-            recoverable = True
-        
-        # System errors
-        elif any(keyword in error_type.lower() for keyword in ['memory', 'disk', 'permission', 'system']):
-            category = ErrorCategory.SYSTEM
-            severity = ErrorSeverity.CRITICAL
-            recoverable = False
         
         return ErrorInfo(
             error_id=error_id,
@@ -243,18 +346,31 @@ class ErrorClassifier:
                 "error_type": error_type,
                 "module": getattr(error, '__module__', 'unknown')
             },
-            traceback=error_traceback,
-            recoverable=recoverable
+            recoverable=recoverable,
+            _exc=error
         )
 
 
+_TRACEBACK_SEVERITIES = frozenset({ErrorSeverity.HIGH, ErrorSeverity.CRITICAL})
+
+_LEVEL_BY_SEVERITY = {
+    ErrorSeverity.LOW: logging.INFO,
+    ErrorSeverity.MEDIUM: logging.WARNING,
+    ErrorSeverity.HIGH: logging.ERROR,
+    ErrorSeverity.CRITICAL: logging.CRITICAL
+}
+
+
 class ErrorHandler:
     """Central error handler with retry logic and circuit breakers"""
     
     def __init__(self):
-        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
-        self.error_history: List[ErrorInfo] = []
+        # Least recently used breakers are evicted beyond max_circuit_breakers
+        self.circuit_breakers: "OrderedDict[str, CircuitBreaker]" = OrderedDict()
+        self.max_circuit_breakers = 1024
         self.max_history_size = 1000
+        # Bounded ring: appends evict the oldest entry in O(1) once full
+        self.error_history: Deque[ErrorInfo] = deque(maxlen=self.max_history_size)
         
         # Default circuit breaker configs
         self.default_configs = {
@@ -265,41 +381,49 @@ class ErrorHandler:
     
     def get_circuit_breaker(self, name: str, category: ErrorCategory) -> CircuitBreaker:
         """Get or create a circuit breaker for the given service"""
-        if name not in self.circuit_breakers:
-            # Use category-specific config or default
-            config_key = category.value if category.value in self.default_configs else "network"
-            config = self.default_configs.get(config_key, CircuitBreakerConfig())
-            self.circuit_breakers[name] = CircuitBreaker(name, config)
+        circuit_breaker = self.circuit_breakers.get(name)
+        if circuit_breaker is not None:
+            self.circuit_breakers.move_to_end(name)
+            return circuit_breaker
+        
+        # Use category-specific config or default
+        config_key = category.value if category.value in self.default_configs else "network"
+        config = self.default_configs.get(config_key, CircuitBreakerConfig())
+        circuit_breaker = CircuitBreaker(name, config)
+        self.circuit_breakers[name] = circuit_breaker
+        
+        if len(self.circuit_breakers) > self.max_circuit_breakers:
+            self.circuit_breakers.popitem(last=False)
         
-        return self.circuit_breakers[name]
+        return circuit_breaker
     
     def record_error(self, error_info: ErrorInfo):
         """Record an error in the history"""
-        self.error_history.append(error_info)
+        # Only serious errors keep a formatted traceback; the exception itself
+        # is released so history entries don't pin frames in memory
+        if error_info.severity in _TRACEBACK_SEVERITIES or logger.isEnabledFor(logging.DEBUG):
+            error_info.get_traceback()
+        error_info._exc = None
         
-        # Limit history size
-        if len(self.error_history) > self.max_history_size:
-            self.error_history = self.error_history[-self.max_history_size:]
+        self.error_history.append(error_info)
         
         # Log the error
-        log_level = {
-            ErrorSeverity.LOW: logging.INFO,
-            ErrorSeverity.MEDIUM: logging.WARNING,
-            ErrorSeverity.HIGH: logging.ERROR,
-            ErrorSeverity.CRITICAL: logging.CRITICAL
-        }.get(error_info.severity, logging.ERROR)
-        
-        logger.log(
-            log_level,
-            f"Error {error_info.error_id} [{error_info.category.value}]: {error_info.message}",
-            extra={
-                "error_id": error_info.error_id,
-                "category": error_info.category.value,
-                "severity": error_info.severity.value,
-                "recoverable": error_info.recoverable,
-                "retry_count": error_info.retry_count
-            }
-        )
+        log_level = _LEVEL_BY_SEVERITY.get(error_info.severity, logging.ERROR)
+        
+        # Skip building the message and extras when the record would be dropped
+        if logger.isEnabledFor(log_level):
+            logger.log(
+                log_level,
+                "Error %s [%s]: %s",
+                error_info.error_id, error_info.category.value, error_info.message,
+                extra={
+                    "error_id": error_info.error_id,
+                    "category": error_info.category.value,
+                    "severity": error_info.severity.value,
+                    "recoverable": error_info.recoverable,
+                    "retry_count": error_info.retry_count
+                }
+            )
     
     async def execute_with_retry(
         self,
@@ -307,7 +431,9 @@ class ErrorHandler:
         *args,
         retry_config: Optional[RetryConfig] = None,
         circuit_breaker_name: Optional[str] = None,
+        category: ErrorCategory = ErrorCategory.UNKNOWN,
         context: Optional[Dict[str, Any]] = None,
+        is_coro: Optional[bool] = None,
         **kwargs
     ) -> Any:
         """
@@ -318,7 +444,9 @@ class ErrorHandler:
             *args: Function arguments
             retry_config: Retry configuration
             circuit_breaker_name: Name for circuit breaker (optional)
+            category: Service category used to pick the circuit breaker config
             context: Additional context for error reporting
+            is_coro: Whether func is a coroutine function (detected if omitted)
             **kwargs: Function keyword arguments
             
         Returns:
@@ -327,33 +455,54 @@ class ErrorHandler:
         Raises:
             Exception: If all retries fail
         """
+        if is_coro is None:
+            is_coro = asyncio.iscoroutinefunction(func)
+        
+        # Fast path: a single attempt without a circuit breaker needs no loop
+        if circuit_breaker_name is None and retry_config is not None and retry_config.max_retries == 0:
+            try:
+                if is_coro:
+                    return await func(*args, **kwargs)
+                return func(*args, **kwargs)
+            except Exception as e:
+                error_info = ErrorClassifier.classify_error(e)
+                error_info.context = context if context is not None else {}
+                self.record_error(error_info)
+                raise
+        
         if retry_config is None:
-            retry_config = RetryConfig()
+            retry_config = _DEFAULT_RETRY_CONFIG
         
         if context is None:
             context = {}
         
         last_error = None
+        delay: Optional[float] = None
+        
+        # Resolve the circuit breaker once rather than on every attempt
+        circuit_breaker = (
+            self.get_circuit_breaker(circuit_breaker_name, category)
+            if circuit_breaker_name else None
+        )
+        
+        # Monotonic clock reading shared by the circuit breaker calls of an attempt
+        now = time.monotonic()
         
         for attempt in range(retry_config.max_retries + 1):
             try:
                 # Check circuit breaker if specified
-                if circuit_breaker_name:
-                    error_info = ErrorClassifier.classify_error(Exception("dummy"))
-                    circuit_breaker = self.get_circuit_breaker(circuit_breaker_name, error_info.category)
-                    
-                    if not circuit_breaker.can_execute():
-                        raise Exception(f"Circuit breaker {circuit_breaker_name} is OPEN")
+                if circuit_breaker is not None and not circuit_breaker.can_execute(now):
+                    raise Exception(f"Circuit breaker {circuit_breaker_name} is OPEN")
                 
                 # Execute the function
-                if asyncio.iscoroutinefunction(func):
+                if is_coro:
                     result = await func(*args, **kwargs)
                 else:
                     result = func(*args, **kwargs)
                 
                 # Record success if using circuit breaker
-                if circuit_breaker_name and circuit_breaker_name in self.circuit_breakers:
-                    self.circuit_breakers[circuit_breaker_name].record_success()
+                if circuit_breaker is not None:
+                    circuit_breaker.record_success()
                 
                 # Log successful retry if this wasn't the first attempt
                 if attempt > 0:
@@ -371,8 +520,10 @@ class ErrorHandler:
                 self.record_error(error_info)
                 
                 # Record failure in circuit breaker
-                if circuit_breaker_name and circuit_breaker_name in self.circuit_breakers:
-                    self.circuit_breakers[circuit_breaker_name].record_failure()
+                if circuit_breaker is not None:
+                    # The call itself may have taken a while, so refresh the clock
+                    now = time.monotonic()
+                    circuit_breaker.record_failure(now)
                 
                 # Don't retry if error is not recoverable
                 if not error_info.recoverable:
@@ -384,16 +535,102 @@ class ErrorHandler:
                     break
                 
                 # Calculate delay and wait
-                delay = retry_config.get_delay(attempt + 1)
+                delay = retry_config.get_delay(attempt + 1, delay)
                 logger.warning(
                     f"Attempt {attempt + 1} failed, retrying in {delay:.2f}s: {error_info.message}"
                 )
                 await asyncio.sleep(delay)
+                now = time.monotonic()
         
         # All retries failed
         logger.error(f"All {retry_config.max_retries + 1} attempts failed")
         raise last_error
     
+    def execute_with_retry_sync(
+        self,
+        func: Callable,
+        *args,
+        retry_config: Optional[RetryConfig] = None,
+        circuit_breaker_name: Optional[str] = None,
+        category: ErrorCategory = ErrorCategory.UNKNOWN,
+        context: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Synchronous counterpart of execute_with_retry for plain functions.
+        
+        Sleeps with time.sleep between attempts, so no event loop is created.
+        Arguments and behavior otherwise match execute_with_retry.
+        """
+        if circuit_breaker_name is None and retry_config is not None and retry_config.max_retries == 0:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                error_info = ErrorClassifier.classify_error(e)
+                error_info.context = context if context is not None else {}
+                self.record_error(error_info)
+                raise
+        
+        if retry_config is None:
+            retry_config = _DEFAULT_RETRY_CONFIG
+        
+        if context is None:
+            context = {}
+        
+        last_error = None
+        delay: Optional[float] = None
+        
+        circuit_breaker = (
+            self.get_circuit_breaker(circuit_breaker_name, category)
+            if circuit_breaker_name else None
+        )
+        
+        now = time.monotonic()
+        
+        for attempt in range(retry_config.max_retries + 1):
+            try:
+                if circuit_breaker is not None and not circuit_breaker.can_execute(now):
+                    raise Exception(f"Circuit breaker {circuit_breaker_name} is OPEN")
+                
+                result = func(*args, **kwargs)
+                
+                if circuit_breaker is not None:
+                    circuit_breaker.record_success()
+                
+                if attempt > 0:
+                    logger.info(f"Function succeeded on attempt {attempt + 1}")
+                
+                return result
+                
+            except Exception as e:
+                last_error = e
+                error_info = ErrorClassifier.classify_error(e)
+                error_info.retry_count = attempt
+                error_info.context = context
+                
+                self.record_error(error_info)
+                
+                if circuit_breaker is not None:
+                    now = time.monotonic()
+                    circuit_breaker.record_failure(now)
+                
+                if not error_info.recoverable:
+                    logger.error(f"Non-recoverable error, not retrying: {error_info.message}")
+                    raise
+                
+                if attempt >= retry_config.max_retries:
+                    break
+                
+                delay = retry_config.get_delay(attempt + 1, delay)
+                logger.warning(
+                    f"Attempt {attempt + 1} failed, retrying in {delay:.2f}s: {error_info.message}"
+                )
+                time.sleep(delay)
+                now = time.monotonic()
+        
+        logger.error(f"All {retry_config.max_retries + 1} attempts failed")
+        raise last_error
+    
     def get_error_statistics(self) -> Dict[str, Any]:
         """Get error statistics and health metrics"""
         if not self.error_history:
@@ -405,18 +642,13 @@ class ErrorHandler:
                 "circuit_breakers": {}
             }
         
-        # Count by category
-        by_category = {}
-        by_severity = {}
+        # Count by category and severity
+        by_category = Counter(error.category.value for error in self.error_history)
+        by_severity = Counter(error.severity.value for error in self.error_history)
         
-        for error in self.error_history:
-            category = error.category.value
-            severity = error.severity.value
-            
-            by_category[category] = by_category.get(category, 0) + 1
-            by_severity[severity] = by_severity.get(severity, 0) + 1
-        
-        # Get recent errors (last 10)
+        # Get recent errors (last 10, oldest first) without copying the history
+        recent = list(islice(reversed(self.error_history), 10))
+        recent.reverse()
         recent_errors = [
             {
                 "error_id": error.error_id,
@@ -426,7 +658,7 @@ class ErrorHandler:
                 "timestamp": error.timestamp.isoformat(),
                 "retry_count": error.retry_count
             }
-            for error in self.error_history[-10:]
+            for error in recent
         ]
         
         # Get circuit breaker statuses
@@ -437,8 +669,8 @@ class ErrorHandler:
         
         return {
             "total_errors": len(self.error_history),
-            "by_category": by_category,
-            "by_severity": by_severity,
+            "by_category": dict(by_category),
+            "by_severity": dict(by_severity),
             "recent_errors": recent_errors,
             "circuit_breakers": circuit_breaker_statuses
         }
@@ -451,7 +683,8 @@ error_handler = ErrorHandler()
 def with_retry(
     retry_config: Optional[RetryConfig] = None,
     circuit_breaker_name: Optional[str] = None,
-    context: Optional[Dict[str, Any]] = None
+    context: Optional[Dict[str, Any]] = None,
+    category: ErrorCategory = ErrorCategory.UNKNOWN
 ):
     """
     Decorator for adding retry logic to functions
@@ -460,29 +693,35 @@ def with_retry(
         retry_config: Retry configuration
         circuit_breaker_name: Circuit breaker name
         context: Additional context
+        category: Service category used to pick the circuit breaker config
     """
     def decorator(func):
+        is_coro = asyncio.iscoroutinefunction(func)
+        
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             return await error_handler.execute_with_retry(
                 func, *args,
                 retry_config=retry_config,
                 circuit_breaker_name=circuit_breaker_name,
+                category=category,
                 context=context,
+                is_coro=is_coro,
                 **kwargs
             )
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            return asyncio.run(error_handler.execute_with_retry(
+            return error_handler.execute_with_retry_sync(
                 func, *args,
                 retry_config=retry_config,
                 circuit_breaker_name=circuit_breaker_name,
+                category=category,
                 context=context,
                 **kwargs
-            ))
+            )
         
-        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        return async_wrapper if is_coro else sync_wrapper
     
     return decorator
 
@@ -500,11 +739,21 @@ def handle_graceful_degradation(
         fallback_value: Static value to return as fallback
         log_fallback: Whether to log fallback usage
     """
+    fallback_is_coro = fallback_func is not None and asyncio.iscoroutinefunction(fallback_func)
+    
     def decorator(func):
+        is_coro = asyncio.iscoroutinefunction(func)
+        
+        if fallback_is_coro and not is_coro:
+            raise TypeError(
+                f"Async fallback {fallback_func.__name__} cannot be used with "
+                f"sync function {func.__name__}"
+            )
+        
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             try:
-                if asyncio.iscoroutinefunction(func):
+                if is_coro:
                     return await func(*args, **kwargs)
                 else:
                     return func(*args, **kwargs)
@@ -516,7 +765,7 @@ def handle_graceful_degradation(
                     logger.warning(f"Function failed, using fallback: {error_info.message}")
                 
                 if fallback_func:
-                    if asyncio.iscoroutinefunction(fallback_func):
+                    if fallback_is_coro:
                         return await fallback_func(*args, **kwargs)
                     else:
                         return fallback_func(*args, **kwargs)
@@ -539,6 +788,6 @@ def handle_graceful_degradation(
                 else:
                     return fallback_value
         
-        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        return async_wrapper if is_coro else sync_wrapper
     
     return decorator
\ No newline at end of file
@@ -9,12 +9,16 @@ This module provides:
 """
 
 import asyncio
+import functools
+import inspect
 import logging
 import time
 import psutil
 import os
-from typing import Dict, Any, List, Optional, Callable
-from datetime import datetime, timedelta
+import numpy as np
+from collections import Counter
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
+from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -31,7 +35,23 @@ class HealthStatus(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+# Non-healthy statuses, most severe first
+_SEVERITY_ORDER = (HealthStatus.CRITICAL, HealthStatus.UNHEALTHY, HealthStatus.DEGRADED)
+
+
+# System alerts, in the order metrics are compared in check_system_alerts
+_ALERT_TYPES = ("high_cpu", "high_memory", "high_disk")
+_ALERT_LABELS = ("CPU", "memory", "disk")
+# Usage at or above which an alert is critical rather than a warning
+_CRITICAL_USAGE = np.array([95.0, 95.0, 98.0])
+
+
+def _isoformat(ts: float) -> str:
+    """Format an epoch timestamp as a naive UTC ISO string"""
+    return datetime.utcfromtimestamp(ts).isoformat()
+
+
+@dataclass(slots=True)
 class HealthCheck:
     """Individual health check configuration"""
     name: str
@@ -40,17 +60,45 @@ class HealthCheck:
     timeout_seconds: float = 10.0
     critical: bool = False
     enabled: bool = True
-    last_check: Optional[datetime] = None
+    last_check: Optional[float] = None  # Epoch seconds
     last_status: HealthStatus = HealthStatus.HEALTHY
     last_error: Optional[str] = None
     consecutive_failures: int = 0
     max_failures: int = 3
+    # Returns an awaitable for one run; sync functions are sent to the executor
+    invoke: Optional[Callable] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.invoke is None:
+            if _is_coroutine_function(self.check_function):
+                self.invoke = self.check_function
+            else:
+                self.invoke = functools.partial(_run_in_executor, self.check_function)
+
 
+def _is_coroutine_function(func: Callable) -> bool:
+    """True for async functions, including ones wrapped in functools.partial"""
+    while isinstance(func, functools.partial):
+        func = func.func
+    return asyncio.iscoroutinefunction(func)
 
-@dataclass
+
+async def _run_in_executor(func: Callable) -> Any:
+    """Run a sync check in the default executor, awaiting any awaitable it returns
+    
+    Callables such as ``lambda: some_coro()`` are not detected as async up front,
+    so their result is awaited here on the event loop.
+    """
+    result = await asyncio.get_running_loop().run_in_executor(None, func)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+@dataclass(slots=True)
 class SystemMetrics:
     """System resource metrics"""
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: float = field(default_factory=time.time)  # Epoch seconds
     cpu_percent: float = 0.0
     memory_percent: float = 0.0
     memory_available_mb: float = 0.0
@@ -61,27 +109,98 @@ class SystemMetrics:
     network_connections: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceHealth:
     """Health status for a service"""
     name: str
     status: HealthStatus
-    last_check: datetime
+    last_check: float  # Epoch seconds
     response_time_ms: float = 0.0
     error_message: Optional[str] = None
     details: Dict[str, Any] = field(default_factory=dict)
 
 
+class MetricsRing:
+    """Fixed-capacity ring buffer of system metrics samples"""
+    
+    DTYPE = np.dtype([
+        ("ts", "f8"),
+        ("cpu", "f8"),
+        ("mem", "f8"),
+        ("disk", "f8"),
+        ("mem_avail", "f8"),
+        ("disk_free", "f8"),
+        ("procs", "i4"),
+        ("files", "i4"),
+        ("conns", "i4"),
+    ])
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.buf = np.zeros(capacity, dtype=self.DTYPE)
+        self.head = 0  # Next slot to write
+        self.count = 0
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def append(self, metrics: SystemMetrics):
+        """Store a sample, overwriting the oldest one once full"""
+        self.buf[self.head] = (
+            metrics.timestamp,
+            metrics.cpu_percent,
+            metrics.memory_percent,
+            metrics.disk_usage_percent,
+            metrics.memory_available_mb,
+            metrics.disk_free_gb,
+            metrics.process_count,
+            metrics.open_files,
+            metrics.network_connections,
+        )
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def ordered(self) -> np.ndarray:
+        """Samples from oldest to newest"""
+        if self.count < self.capacity:
+            return self.buf[:self.count]
+        return np.concatenate((self.buf[self.head:], self.buf[:self.head]))
+    
+    def window(self, since: float) -> np.ndarray:
+        """Samples taken at or after the given epoch time, oldest first"""
+        samples = self.ordered()
+        # Samples are appended in time order, so the window is a contiguous tail
+        start = np.searchsorted(samples["ts"], since, side="left")
+        return samples[start:]
+    
+    def view(self, column: str, since: float) -> np.ndarray:
+        """One column of the samples taken at or after the given epoch time"""
+        return self.window(since)[column]
+
+
 class HealthMonitor:
     """Comprehensive health monitoring system"""
     
     def __init__(self):
         self.health_checks: Dict[str, HealthCheck] = {}
-        self.system_metrics_history: List[SystemMetrics] = []
         self.service_health: Dict[str, ServiceHealth] = {}
+        # Number of services currently in each status, kept in step with service_health
+        self._status_counts: Counter = Counter()
+        
+        # Last get_overall_health report, reused for a short time between check results
+        self.overall_cache_seconds = 1.0
+        self._overall_cache: Optional[Dict[str, Any]] = None
+        self._overall_cache_time = 0.0
         self.max_history_size = 1440  # 24 hours of minute-by-minute data
-        self.monitoring_task: Optional[asyncio.Task] = None
+        self.metrics_ring = MetricsRing(self.max_history_size)
+        self.latest_metrics: Optional[SystemMetrics] = None
         self.running = False
+        self.metrics_interval_seconds = 10.0
+        
+        # Pending timer per scheduled job (health check name or metrics sampler)
+        self._handles: Dict[str, asyncio.TimerHandle] = {}
+        # In-flight job tasks, referenced so they aren't garbage collected
+        self._tasks: Set[asyncio.Task] = set()
         
         # Thresholds for alerts
         self.cpu_threshold = 80.0
@@ -89,6 +208,21 @@ class HealthMonitor:
         self.disk_threshold = 90.0
         self.response_time_threshold = 5000.0  # 5 seconds
         
+        # Repeated alerts with the same key are logged at most once per interval
+        self.alert_min_interval = 60.0
+        self._last_alert_emit: Dict[str, float] = {}
+        self._suppressed_alerts: Dict[str, int] = {}
+        
+        # Prime psutil's CPU counter so later non-blocking reads have a baseline
+        psutil.cpu_percent(interval=None)
+        
+        # Handle for this process, reused across samples
+        self._proc = psutil.Process()
+        
+        # Disk usage barely moves between samples, so it is refreshed less often
+        self.disk_cache_seconds = 60.0
+        self._disk_cache: Optional[Tuple[float, Any]] = None
+        
     def register_health_check(
         self,
         name: str,
@@ -106,20 +240,23 @@ class HealthMonitor:
             critical=critical
         )
         logger.info(f"Registered health check: {name}")
+        
+        # Checks registered after startup join the schedule immediately
+        if self.running:
+            self._schedule_check(self.health_checks[name], delay=0.0)
     
     async def run_health_check(self, check: HealthCheck) -> ServiceHealth:
         """Run a single health check"""
-        start_time = time.time()
+        start_time = time.monotonic()
+        details: Dict[str, Any] = {}
         
         try:
             # Run the check with timeout
             result = await asyncio.wait_for(
-                check.check_function(),
+                check.invoke(),
                 timeout=check.timeout_seconds
             )
             
-            response_time = (time.time() - start_time) * 1000  # Convert to ms
-            
             # Determine status based on result
             if isinstance(result, dict):
                 status = HealthStatus(result.get("status", "healthy"))
@@ -127,75 +264,51 @@ class HealthMonitor:
                 error_message = result.get("error")
             elif isinstance(result, bool):
                 status = HealthStatus.HEALTHY if result else HealthStatus.UNHEALTHY
-                details = {}
                 error_message = None if result else "Health check returned False"
             else:
                 status = HealthStatus.HEALTHY
                 details = {"result": str(result)}
                 error_message = None
             
-            # Update check status
-            check.last_check = datetime.utcnow()
-            check.last_status = status
-            check.last_error = error_message
-            
-            if status == HealthStatus.HEALTHY:
-                check.consecutive_failures = 0
-            else:
-                check.consecutive_failures += 1
-            
-            # Create service health record
-            service_health = ServiceHealth(
-                name=check.name,
-                status=status,
-                last_check=check.last_check,
-                response_time_ms=response_time,
-                error_message=error_message,
-                details=details
-            )
-            
-            # Log slow responses
-            if response_time > self.response_time_threshold:
-                logger.warning(
-                    f"Health check {check.name} took {response_time:.1f}ms",
-                    extra={"health_check": check.name, "response_time_ms": response_time}
-                )
-            
-            return service_health
-            
         except asyncio.TimeoutError:
-            check.consecutive_failures += 1
-            check.last_error = f"Health check timed out after {check.timeout_seconds}s"
-            check.last_status = HealthStatus.UNHEALTHY
-            
+            status = HealthStatus.UNHEALTHY
+            error_message = f"Health check timed out after {check.timeout_seconds}s"
             logger.error(f"Health check {check.name} timed out")
             
-            return ServiceHealth(
-                name=check.name,
-                status=HealthStatus.UNHEALTHY,
-                last_check=datetime.utcnow(),
-                error_message=check.last_error
-            )
-            
         except Exception as e:
-            check.consecutive_failures += 1
-            check.last_error = str(e)
-            check.last_status = HealthStatus.UNHEALTHY
-            
+            status = HealthStatus.UNHEALTHY
+            error_message = str(e)
             logger.error(f"Health check {check.name} failed: {e}")
-            
-            return ServiceHealth(
-                name=check.name,
-                status=HealthStatus.UNHEALTHY,
-                last_check=datetime.utcnow(),
-                error_message=str(e)
+        
+        response_time = (time.monotonic() - start_time) * 1000  # Convert to ms
+        
+        # Update check status
+        check.last_check = time.time()
+        check.last_status = status
+        check.last_error = error_message
+        check.consecutive_failures = 0 if status == HealthStatus.HEALTHY else check.consecutive_failures + 1
+        
+        # Log slow responses
+        if response_time > self.response_time_threshold and self._should_emit(f"slow:{check.name}"):
+            logger.warning(
+                f"Health check {check.name} took {response_time:.1f}ms",
+                extra={"health_check": check.name, "response_time_ms": response_time}
             )
+        
+        return ServiceHealth(
+            name=check.name,
+            status=status,
+            last_check=check.last_check,
+            response_time_ms=response_time,
+            error_message=error_message,
+            details=details
+        )
     
     def collect_system_metrics(self) -> SystemMetrics:
         """Collect current system metrics"""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU usage since the previous sample (non-blocking)
+            cpu_percent = psutil.cpu_percent(interval=None)
             
             # Memory usage
             memory = psutil.virtual_memory()
@@ -203,17 +316,17 @@ class HealthMonitor:
             memory_available_mb = memory.available / (1024 * 1024)
             
             # Disk usage
-            disk = psutil.disk_usage('/')
+            disk = self._disk_usage()
             disk_usage_percent = (disk.used / disk.total) * 100
             disk_free_gb = disk.free / (1024 * 1024 * 1024)
             
             # Process information
             process_count = len(psutil.pids())
             
-            # Current process info
-            current_process = psutil.Process()
-            open_files = len(current_process.open_files())
-            network_connections = len(current_process.connections())
+            # Current process info, with /proc reads shared across calls
+            with self._proc.oneshot():
+                open_files = len(self._proc.open_files())
+                network_connections = len(self._proc.connections())
             
             return SystemMetrics(
                 cpu_percent=cpu_percent,
@@ -230,95 +343,198 @@ class HealthMonitor:
             logger.error(f"Error collecting system metrics: {e}")
             return SystemMetrics()  # Return empty metrics
     
+    def _disk_usage(self):
+        """Root filesystem usage, cached for disk_cache_seconds"""
+        now = time.monotonic()
+        if self._disk_cache is not None and now - self._disk_cache[0] < self.disk_cache_seconds:
+            return self._disk_cache[1]
+        
+        disk = psutil.disk_usage('/')
+        self._disk_cache = (now, disk)
+        return disk
+    
     def check_system_alerts(self, metrics: SystemMetrics):
         """Check system metrics against thresholds and generate alerts"""
-        alerts = []
-        
-        # CPU alert
-        if metrics.cpu_percent > self.cpu_threshold:
-            alerts.append({
-                "type": "high_cpu",
-                "severity": "warning" if metrics.cpu_percent < 95 else "critical",
-                "message": f"High CPU usage: {metrics.cpu_percent:.1f}%",
-                "value": metrics.cpu_percent,
-                "threshold": self.cpu_threshold
-            })
-        
-        # Memory alert
-        if metrics.memory_percent > self.memory_threshold:
-            alerts.append({
-                "type": "high_memory",
-                "severity": "warning" if metrics.memory_percent < 95 else "critical",
-                "message": f"High memory usage: {metrics.memory_percent:.1f}%",
-                "value": metrics.memory_percent,
-                "threshold": self.memory_threshold
-            })
-        
-        # Disk alert
-        if metrics.disk_usage_percent > self.disk_threshold:
-            alerts.append({
-                "type": "high_disk",
-                "severity": "warning" if metrics.disk_usage_percent < 98 else "critical",
-                "message": f"High disk usage: {metrics.disk_usage_percent:.1f}%",
-                "value": metrics.disk_usage_percent,
-                "threshold": self.disk_threshold
-            })
+        values = np.array(
+            [metrics.cpu_percent, metrics.memory_percent, metrics.disk_usage_percent]
+        )
+        thresholds = np.array([self.cpu_threshold, self.memory_threshold, self.disk_threshold])
+        
+        # Compare all metrics at once; only breached ones are inspected further
+        breached = np.flatnonzero(values > thresholds)
+        critical = values >= _CRITICAL_USAGE
+        
+        alerts = [
+            {
+                "type": _ALERT_TYPES[i],
+                "severity": "critical" if critical[i] else "warning",
+                "message": f"High {_ALERT_LABELS[i]} usage: {values[i]:.1f}%",
+                "value": float(values[i]),
+                "threshold": float(thresholds[i])
+            }
+            for i in breached
+        ]
         
         # Log alerts
         for alert in alerts:
+            if not self._should_emit(alert["type"]):
+                continue
             level = logging.CRITICAL if alert["severity"] == "critical" else logging.WARNING
-            logger.log(level, alert["message"], extra=alert)
-    
-    async def monitoring_loop(self):
-        """Main monitoring loop"""
-        logger.info("Health monitoring started")
-        
-        while self.running:
-            try:
-                # Collect system metrics
-                metrics = self.collect_system_metrics()
-                self.system_metrics_history.append(metrics)
-                
-                # Limit history size
-                if len(self.system_metrics_history) > self.max_history_size:
-                    self.system_metrics_history = self.system_metrics_history[-self.max_history_size:]
-                
-                # Check for system alerts
-                self.check_system_alerts(metrics)
-                
-                # Run health checks
-                current_time = datetime.utcnow()
-                for check in self.health_checks.values():
-                    if not check.enabled:
-                        continue
-                    
-                    # Check if it's time to run this check
-                    if (check.last_check is None or 
-                        (current_time - check.last_check).total_seconds() >= check.interval_seconds):
-                        
-                        service_health = await self.run_health_check(check)
-                        self.service_health[check.name] = service_health
-                        
-                        # Generate alerts for critical services
-                        if (check.critical and 
-                            check.consecutive_failures >= check.max_failures and
-                            service_health.status in [HealthStatus.UNHEALTHY, HealthStatus.CRITICAL]):
-                            
-                            logger.critical(
-                                f"Critical service {check.name} is unhealthy",
-                                extra={
-                                    "service": check.name,
-                                    "consecutive_failures": check.consecutive_failures,
-                                    "error": check.last_error
-                                }
-                            )
-                
-                # Sleep for a short interval before next check
-                await asyncio.sleep(10)  # Check every 10 seconds
-                
-            except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
-                await asyncio.sleep(30)  # Wait longer on error
+            # "message" is a reserved LogRecord attribute, so it can't go in extra
+            extra = {key: value for key, value in alert.items() if key != "message"}
+            logger.log(level, alert["message"], extra=extra)
+    
+    def _should_emit(self, key: str, min_interval: Optional[float] = None) -> bool:
+        """
+        Rate limit repeated log messages by key.
+        
+        Args:
+            key: Identifies a family of near-identical messages
+            min_interval: Minimum seconds between emitted messages (alert_min_interval if omitted)
+            
+        Returns:
+            True if the message should be logged now
+        """
+        if min_interval is None:
+            min_interval = self.alert_min_interval
+        
+        now = time.monotonic()
+        last = self._last_alert_emit.get(key)
+        if last is not None and now - last < min_interval:
+            self._suppressed_alerts[key] = self._suppressed_alerts.get(key, 0) + 1
+            return False
+        
+        self._last_alert_emit[key] = now
+        suppressed = self._suppressed_alerts.pop(key, 0)
+        if suppressed:
+            logger.info(
+                f"Suppressed {suppressed} repeated '{key}' messages in the last {now - last:.0f}s",
+                extra={"alert_key": key, "suppressed_count": suppressed}
+            )
+        return True
+    
+    def _spawn(self, job: Callable, *args):
+        """Timer callback: run a job coroutine as a tracked task"""
+        task = asyncio.create_task(job(*args))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    def _schedule_check(self, check: HealthCheck, delay: Optional[float] = None):
+        """Schedule the next run of a health check (after its interval by default)"""
+        previous = self._handles.pop(check.name, None)
+        if previous is not None:
+            previous.cancel()
+        
+        if delay is None:
+            delay = check.interval_seconds
+        
+        self._handles[check.name] = asyncio.get_running_loop().call_later(
+            delay, self._spawn, self._run_and_reschedule, check
+        )
+    
+    def _record_result(self, check: HealthCheck, service_health: ServiceHealth):
+        """Store a health check result and alert on failing critical services"""
+        previous = self.service_health.get(check.name)
+        if previous is not None:
+            self._status_counts[previous.status] -= 1
+        self._status_counts[service_health.status] += 1
+        self.service_health[check.name] = service_health
+        self._overall_cache = None
+        
+        # Generate alerts for critical services
+        if (check.critical and 
+            check.consecutive_failures >= check.max_failures and
+            service_health.status in [HealthStatus.UNHEALTHY, HealthStatus.CRITICAL]):
+            
+            logger.critical(
+                f"Critical service {check.name} is unhealthy",
+                extra={
+                    "service": check.name,
+                    "consecutive_failures": check.consecutive_failures,
+                    "error": check.last_error
+                }
+            )
+    
+    async def _run_and_reschedule(self, check: HealthCheck):
+        """Run a health check, record the result and schedule its next run"""
+        try:
+            if check.enabled:
+                service_health = await self.run_health_check(check)
+                self._record_result(check, service_health)
+        except Exception as e:
+            logger.error(f"Error running health check {check.name}: {e}")
+        finally:
+            # Re-registered or removed checks are rescheduled by their replacement
+            if self.running and self.health_checks.get(check.name) is check:
+                self._schedule_check(check)
+    
+    async def run_health_checks(self, checks: Optional[List[HealthCheck]] = None) -> Dict[str, ServiceHealth]:
+        """
+        Run several health checks concurrently and record their results.
+        
+        Args:
+            checks: Checks to run (all enabled checks if omitted)
+            
+        Returns:
+            Mapping of check name to its new service health
+        """
+        if checks is None:
+            checks = [check for check in self.health_checks.values() if check.enabled]
+        
+        # Wall time is bounded by the slowest check instead of the sum of all
+        results = await asyncio.gather(
+            *(self.run_health_check(check) for check in checks),
+            return_exceptions=True
+        )
+        
+        recorded = {}
+        for check, result in zip(checks, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error running health check {check.name}: {result}")
+                continue
+            self._record_result(check, result)
+            recorded[check.name] = result
+        
+        return recorded
+    
+    async def _run_initial_checks(self, checks: List[HealthCheck]):
+        """Run never-run checks together at startup, then put them on their timers"""
+        try:
+            await self.run_health_checks(checks)
+        finally:
+            if self.running:
+                for check in checks:
+                    if self.health_checks.get(check.name) is check:
+                        self._schedule_check(check)
+    
+    def _schedule_metrics(self, delay: Optional[float] = None):
+        """Schedule the next system metrics sample"""
+        if delay is None:
+            delay = self.metrics_interval_seconds
+        
+        self._handles["__system_metrics__"] = asyncio.get_running_loop().call_later(
+            delay, self._spawn, self._sample_metrics
+        )
+    
+    async def _sample_metrics(self):
+        """Sample system metrics, check alert thresholds and reschedule"""
+        delay = None
+        try:
+            # Collect system metrics off the event loop thread
+            metrics = await asyncio.get_running_loop().run_in_executor(
+                None, self.collect_system_metrics
+            )
+            self.metrics_ring.append(metrics)
+            self.latest_metrics = metrics
+            
+            # Check for system alerts
+            self.check_system_alerts(metrics)
+        except Exception as e:
+            logger.error(f"Error sampling system metrics: {e}")
+            delay = 30.0  # Wait longer on error
+        finally:
+            if self.running:
+                self._schedule_metrics(delay)
     
     async def start_monitoring(self):
         """Start the health monitoring system"""
@@ -327,7 +543,20 @@ class HealthMonitor:
             return
         
         self.running = True
-        self.monitoring_task = asyncio.create_task(self.monitoring_loop())
+        
+        # Each job reschedules itself, so wakeups follow the check intervals
+        self._schedule_metrics(delay=0.0)
+        
+        initial_checks = []
+        for check in self.health_checks.values():
+            if check.enabled and check.last_check is None:
+                initial_checks.append(check)
+            else:
+                self._schedule_check(check)
+        
+        if initial_checks:
+            self._spawn(self._run_initial_checks, initial_checks)
+        
         logger.info("Health monitoring system started")
     
     async def stop_monitoring(self):
@@ -336,50 +565,64 @@ class HealthMonitor:
             return
         
         self.running = False
-        if self.monitoring_task:
-            self.monitoring_task.cancel()
-            try:
-                await self.monitoring_task
-            except asyncio.CancelledError:
-                pass
+        
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
+        
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
         
         logger.info("Health monitoring system stopped")
     
+    def _prune_service_health(self):
+        """Drop results for checks that were removed or disabled"""
+        stale = [
+            name for name in self.service_health
+            if name not in self.health_checks or not self.health_checks[name].enabled
+        ]
+        for name in stale:
+            self._status_counts[self.service_health.pop(name).status] -= 1
+    
     def get_overall_health(self) -> Dict[str, Any]:
         """Get overall system health status"""
+        now = time.monotonic()
+        if self._overall_cache is not None and now - self._overall_cache_time < self.overall_cache_seconds:
+            # Shallow copy so callers can add top-level keys without touching the cache
+            return dict(self._overall_cache)
+        
+        self._prune_service_health()
         if not self.service_health:
             return {
                 "status": "unknown",
                 "message": "No health checks have been run yet"
             }
         
-        # Determine overall status
-        statuses = [service.status for service in self.service_health.values()]
-        
-        if any(status == HealthStatus.CRITICAL for status in statuses):
-            overall_status = HealthStatus.CRITICAL
-        elif any(status == HealthStatus.UNHEALTHY for status in statuses):
-            overall_status = HealthStatus.UNHEALTHY
-        elif any(status == HealthStatus.DEGRADED for status in statuses):
-            overall_status = HealthStatus.DEGRADED
+        # Determine overall status from the most severe status present
+        for status in _SEVERITY_ORDER:
+            if self._status_counts[status]:
+                overall_status = status
+                break
         else:
             overall_status = HealthStatus.HEALTHY
         
         # Get latest system metrics
-        latest_metrics = self.system_metrics_history[-1] if self.system_metrics_history else None
+        latest_metrics = self.latest_metrics
         
         # Count services by status
-        status_counts = {}
-        for service in self.service_health.values():
-            status_counts[service.status.value] = status_counts.get(service.status.value, 0) + 1
+        status_counts = {
+            status.value: count for status, count in self._status_counts.items() if count
+        }
         
-        return {
+        self._overall_cache = {
             "status": overall_status.value,
             "timestamp": datetime.utcnow().isoformat(),
             "services": {
                 name: {
                     "status": service.status.value,
-                    "last_check": service.last_check.isoformat(),
+                    "last_check": _isoformat(service.last_check),
                     "response_time_ms": service.response_time_ms,
                     "error": service.error_message
                 }
@@ -390,52 +633,39 @@ class HealthMonitor:
                 "cpu_percent": latest_metrics.cpu_percent if latest_metrics else 0,
                 "memory_percent": latest_metrics.memory_percent if latest_metrics else 0,
                 "disk_usage_percent": latest_metrics.disk_usage_percent if latest_metrics else 0,
-                "timestamp": latest_metrics.timestamp.isoformat() if latest_metrics else None
+                "timestamp": _isoformat(latest_metrics.timestamp) if latest_metrics else None
             },
             "error_statistics": error_handler.get_error_statistics()
         }
+        self._overall_cache_time = now
+        return dict(self._overall_cache)
     
     def get_metrics_summary(self, hours: int = 1) -> Dict[str, Any]:
         """Get system metrics summary for the specified time period"""
-        if not self.system_metrics_history:
+        if not len(self.metrics_ring):
             return {"error": "No metrics data available"}
         
         # Filter metrics for the specified time period
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        recent_metrics = [
-            m for m in self.system_metrics_history
-            if m.timestamp >= cutoff_time
-        ]
+        cutoff_time = time.time() - hours * 3600
+        recent_metrics = self.metrics_ring.window(cutoff_time)
         
-        if not recent_metrics:
+        if not len(recent_metrics):
             return {"error": f"No metrics data available for the last {hours} hours"}
         
-        # Calculate statistics
-        cpu_values = [m.cpu_percent for m in recent_metrics]
-        memory_values = [m.memory_percent for m in recent_metrics]
-        disk_values = [m.disk_usage_percent for m in recent_metrics]
+        def summarize(values: np.ndarray) -> Dict[str, float]:
+            return {
+                "current": float(values[-1]),
+                "average": float(values.mean()),
+                "max": float(values.max()),
+                "min": float(values.min())
+            }
         
         return {
             "time_period_hours": hours,
             "data_points": len(recent_metrics),
-            "cpu": {
-                "current": cpu_values[-1],
-                "average": sum(cpu_values) / len(cpu_values),
-                "max": max(cpu_values),
-                "min": min(cpu_values)
-            },
-            "memory": {
-                "current": memory_values[-1],
-                "average": sum(memory_values) / len(memory_values),
-                "max": max(memory_values),
-                "min": min(memory_values)
-            },
-            "disk": {
-                "current": disk_values[-1],
-                "average": sum(disk_values) / len(disk_values),
-                "max": max(disk_values),
-                "min": min(disk_values)
-            }
+            "cpu": summarize(recent_metrics["cpu"]),
+            "memory": summarize(recent_metrics["mem"]),
+            "disk": summarize(recent_metrics["disk"])
         }
 
 
@@ -9,16 +9,35 @@ This module provides:
 - Request/response logging
 """
 
+import atexit
 import logging
 import logging.handlers
-import json
+import queue
 import time
 import sys
 import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+import orjson
+
+
+# Record attributes copied into JSON log entries when set via ``extra``
+_EXTRA_FIELDS = (
+    'error_id',
+    'category',
+    'severity',
+    'retry_count',
+    'processing_time',
+    'client_id',
+    'request_id',
+)
+_EXTRA_FIELD_SET = frozenset(_EXTRA_FIELDS)
+
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
@@ -26,7 +45,7 @@ class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON"""
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcfromtimestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -35,27 +54,74 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
         
-        # Add extra fields if present
-        if hasattr(record, 'error_id'):
-            log_entry['error_id'] = record.error_id
-        if hasattr(record, 'category'):
-            log_entry['category'] = record.category
-        if hasattr(record, 'severity'):
-            log_entry['severity'] = record.severity
-        if hasattr(record, 'retry_count'):
-            log_entry['retry_count'] = record.retry_count
-        if hasattr(record, 'processing_time'):
-            log_entry['processing_time'] = record.processing_time
-        if hasattr(record, 'client_id'):
-            log_entry['client_id'] = record.client_id
-        if hasattr(record, 'request_id'):
-            log_entry['request_id'] = record.request_id
+        # Add extra fields if present; most records carry none, so check that first
+        attrs = record.__dict__
+        if not _EXTRA_FIELD_SET.isdisjoint(attrs):
+            for key in _EXTRA_FIELDS:
+                value = attrs.get(key)
+                if value is not None:
+                    log_entry[key] = value
         
-        # Add exception info if present
+        # Add exception info if present, formatted once per record and shared across handlers
         if record.exc_info:
-            log_entry['exception'] = self.formatException(record.exc_info)
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            log_entry['exception'] = record.exc_text
         
-        return json.dumps(log_entry, default=str)
+        return orjson.dumps(log_entry, default=str).decode()
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for an in-process queue that leaves formatting to the listener's handlers"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge message arguments now, but keep exc_info for the real formatter"""
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# (logger, queue handler, listener) triples started by the most recent setup_logging call
+_active_listeners: List[Tuple[logging.Logger, LocalQueueHandler, logging.handlers.QueueListener]] = []
+
+
+def _add_listener(logger: logging.Logger, *handlers: logging.Handler):
+    """Route a logger through a queue drained by a (not yet started) listener writing to ``handlers``"""
+    log_queue = queue.Queue(-1)
+    queue_handler = LocalQueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.addHandler(queue_handler)
+    _active_listeners.append((logger, queue_handler, listener))
+
+
+def stop_logging():
+    """Stop background log listeners, flushing any queued or buffered records
+    
+    The listeners' handlers are attached straight to their loggers again, so
+    records logged after shutdown are still written rather than queued for a
+    listener that no longer runs.
+    """
+    while _active_listeners:
+        logger, queue_handler, listener = _active_listeners.pop()
+        listener.stop()
+        logger.removeHandler(queue_handler)
+        for handler in listener.handlers:
+            handler.flush()
+            logger.addHandler(handler)
+
+
+def _buffered(handler: logging.Handler, level: int) -> logging.handlers.MemoryHandler:
+    """Batch records for a file handler, writing at once on errors or when full"""
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=256,
+        flushLevel=logging.ERROR,
+        target=handler
+    )
+    memory_handler.setLevel(level)
+    return memory_handler
+
+
+atexit.register(stop_logging)
 
 
 class PerformanceLogger:
@@ -65,19 +131,30 @@ class PerformanceLogger:
         self.logger = logging.getLogger(logger_name)
         self.start_times: Dict[str, float] = {}
     
+    @contextmanager
+    def timed(self, operation_id: str, context: Optional[Dict[str, Any]] = None):
+        """Time the enclosed block and log its duration, even if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._log_duration(operation_id, time.perf_counter() - start, context)
+    
     def start_timer(self, operation_id: str):
-        """Start timing an operation"""
-        self.start_times[operation_id] = time.time()
+        """Start timing an operation (prefer timed())"""
+        self.start_times[operation_id] = time.perf_counter()
     
     def end_timer(self, operation_id: str, context: Optional[Dict[str, Any]] = None):
-        """End timing and log the duration"""
-        if operation_id not in self.start_times:
+        """End timing and log the duration (prefer timed())"""
+        start = self.start_times.pop(operation_id, None)
+        if start is None:
             self.logger.warning(f"Timer {operation_id} was not started")
             return
         
-        duration = time.time() - self.start_times[operation_id]
-        del self.start_times[operation_id]
-        
+        self._log_duration(operation_id, time.perf_counter() - start, context)
+    
+    def _log_duration(self, operation_id: str, duration: float, context: Optional[Dict[str, Any]]):
+        """Log a completed operation's duration"""
         log_context = context or {}
         log_context.update({
             "operation_id": operation_id,
@@ -118,29 +195,34 @@ class ErrorTracker:
     
     def __init__(self, logger_name: str = "error_tracker"):
         self.logger = logging.getLogger(logger_name)
-        self.error_counts: Dict[str, int] = {}
-        self.last_reset = time.time()
+        self.error_counts: Dict[str, int] = defaultdict(int)
+        self.last_reset = time.time()  # Wall clock, for reporting
+        self._window_start = time.monotonic()
         self.reset_interval = 3600  # Reset counts every hour
+        self._lock = threading.Lock()
     
     def track_error(self, error_type: str, error_message: str, context: Optional[Dict[str, Any]] = None):
         """Track an error occurrence"""
-        # Reset counts if interval has passed
-        if time.time() - self.last_reset > self.reset_interval:
-            self.error_counts.clear()
-            self.last_reset = time.time()
-        
-        # Increment error count
-        self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
+        with self._lock:
+            # Start a fresh window if interval has passed
+            now = time.monotonic()
+            if now - self._window_start > self.reset_interval:
+                self.error_counts = defaultdict(int)
+                self._window_start = now
+                self.last_reset = time.time()
+            
+            # Increment error count
+            self.error_counts[error_type] += 1
+            count = self.error_counts[error_type]
         
         log_context = context or {}
         log_context.update({
             "error_type": error_type,
-            "error_count": self.error_counts[error_type],
+            "error_count": count,
             "time_window": "1h"
         })
         
         # Log with escalating severity based on frequency
-        count = self.error_counts[error_type]
         if count >= 10:
             level = logging.CRITICAL
         elif count >= 5:
@@ -158,11 +240,15 @@ class ErrorTracker:
     
     def get_error_summary(self) -> Dict[str, Any]:
         """Get summary of tracked errors"""
+        with self._lock:
+            error_counts = dict(self.error_counts)
+            last_reset = self.last_reset
+        
         return {
-            "error_counts": dict(self.error_counts),
-            "total_errors": sum(self.error_counts.values()),
-            "unique_error_types": len(self.error_counts),
-            "time_window_start": datetime.fromtimestamp(self.last_reset).isoformat(),
+            "error_counts": error_counts,
+            "total_errors": sum(error_counts.values()),
+            "unique_error_types": len(error_counts),
+            "time_window_start": datetime.fromtimestamp(last_reset).isoformat(),
             "reset_interval_seconds": self.reset_interval
         }
 
@@ -199,6 +285,9 @@ def setup_logging(
         log_dir = "logs"
         Path(log_dir).mkdir(exist_ok=True)
     
+    # Stop listeners from a previous configuration
+    stop_logging()
+    
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
@@ -206,6 +295,9 @@ def setup_logging(
     # Clear existing handlers
     root_logger.handlers.clear()
     
+    # Handlers that actually format and write, run on listener threads
+    root_handlers = []
+    
     # Choose formatter
     if enable_json_logging:
         formatter = JSONFormatter()
@@ -218,7 +310,7 @@ def setup_logging(
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    root_handlers.append(console_handler)
     
     # File handlers
     if enable_file_logging:
@@ -230,7 +322,7 @@ def setup_logging(
         )
         app_handler.setLevel(numeric_level)
         app_handler.setFormatter(formatter)
-        root_logger.addHandler(app_handler)
+        root_handlers.append(_buffered(app_handler, numeric_level))
         
         # Error log (ERROR and above only)
         error_handler = logging.handlers.RotatingFileHandler(
@@ -240,7 +332,7 @@ def setup_logging(
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(formatter)
-        root_logger.addHandler(error_handler)
+        root_handlers.append(error_handler)
         
         # Performance log
         perf_logger = logging.getLogger("performance")
@@ -251,9 +343,18 @@ def setup_logging(
         )
         perf_handler.setLevel(logging.DEBUG)
         perf_handler.setFormatter(formatter)
-        perf_logger.addHandler(perf_handler)
+        perf_logger.handlers.clear()
         perf_logger.setLevel(logging.DEBUG)
         perf_logger.propagate = False  # Don't propagate to root logger
+        
+        # Separate queue so performance records stay out of the root handlers
+        _add_listener(perf_logger, _buffered(perf_handler, logging.DEBUG))
+    
+    # Loggers only enqueue records; formatting and I/O happen on listener threads
+    _add_listener(root_logger, *root_handlers)
+    
+    for _, _, listener in _active_listeners:
+        listener.start()
     
     # Create specialized loggers
     loggers = {
@@ -263,7 +364,8 @@ def setup_logging(
         "websocket": logging.getLogger("websocket"),
         "error_handler": logging.getLogger("error_handler"),
         "performance": PerformanceLogger(),
-        "error_tracker": ErrorTracker()
+        "error_tracker": ErrorTracker(),
+        "listeners": [listener for _, _, listener in _active_listeners]
     }
     
     # Set levels for specialized loggers
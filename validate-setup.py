@@ -5,11 +5,32 @@ Validation script to check if the project structure is correctly set up.
 
 import os
 import json
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+@lru_cache(maxsize=None)
+def list_directory(directory):
+    """Return the set of entry names in a directory, read once per run."""
+    try:
+        with os.scandir(directory or ".") as entries:
+            return frozenset(entry.name for entry in entries)
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
+
+def path_exists(filepath):
+    """Check a path against its parent directory's cached listing."""
+    directory, name = os.path.split(filepath)
+    return name in list_directory(directory)
+
 def check_file_exists(filepath, description):
     """Check if a file exists and print status."""
-    if os.path.exists(filepath):
+    if path_exists(filepath):
         print(f"✅ {description}: {filepath}")
         return True
     else:
@@ -18,16 +39,19 @@ def check_file_exists(filepath, description):
 
 def check_json_valid(filepath, description):
     """Check if a JSON file is valid."""
-    if not os.path.exists(filepath):
+    if not path_exists(filepath):
         print(f"❌ {description}: {filepath} (missing)")
         return False
     
     try:
-        with open(filepath, 'r') as f:
-            json.load(f)
+        data = Path(filepath).read_bytes()
+        if ORJSON_AVAILABLE:
+            orjson.loads(data)
+        else:
+            json.loads(data)
         print(f"✅ {description}: {filepath} (valid JSON)")
         return True
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"❌ {description}: {filepath} (invalid JSON: {e})")
         return False
 
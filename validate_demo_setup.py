@@ -8,9 +8,106 @@ import asyncio
 import aiohttp
 import json
 import time
+from time import perf_counter
 import sys
-from typing import Dict, List, Any, Optional
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable, Type
 from pathlib import Path
+from types import SimpleNamespace
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# The frontend title marker sits in the document head, so only the start of
+# the page needs to be scanned; error bodies are trimmed for the report.
+TITLE_MARKER = b"AI Knowledge Mapper"
+MAX_PAGE_SCAN_BYTES = 64 * 1024
+MAX_ERROR_BYTES = 2048
+MAX_EXPORT_BYTES = 64 * 1024 * 1024
+
+# Request timeouts; ingestion and Q&A use the session default. sock_read also
+# bounds the wait for response headers, so it is only set on the cheap health
+# and page probes; search, export and the benchmark probes may legitimately
+# spend most of their total budget before replying.
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=2)
+HEALTH_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=2, sock_read=5)
+SEARCH_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=2)
+EXPORT_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=2)
+BENCH_SEARCH_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=2)
+BENCH_QA_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=2)
+WS_HANDSHAKE_TIMEOUT = 2.0
+WARMUP_TIMEOUT = aiohttp.ClientTimeout(total=2)
+
+# Probes speak JSON to the backend except for the frontend page itself
+DEFAULT_HEADERS = {"Accept": "application/json", "User-Agent": "demo-validator/1.0"}
+HTML_HEADERS = {"Accept": "text/html"}
+
+
+@dataclass(slots=True)
+class TestResult:
+    """Outcome of a single validation check."""
+    test: str
+    success: bool
+    message: str
+    duration_ms: float
+    timestamp: float
+
+
+def dump_json(payload: Any) -> bytes:
+    """Serialize ``payload`` as indented JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        # orjson serializes dataclasses such as TestResult natively
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2, default=asdict).encode()
+
+
+def write_json(path: Path, payload: Any):
+    """Serialize ``payload`` and write it to ``path`` in one blocking call."""
+    path.write_bytes(dump_json(payload))
+
+
+async def read_json(response: aiohttp.ClientResponse, max_bytes: Optional[int] = None) -> Any:
+    """Parse a JSON response body straight from bytes.
+    
+    When ``max_bytes`` is given the body is streamed and a ValueError is
+    raised as soon as it grows past the cap.
+    """
+    if max_bytes is None:
+        body = await response.read()
+    else:
+        if (response.content_length or 0) > max_bytes:
+            raise ValueError(f"Response body exceeds {max_bytes} bytes")
+        buffer = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            buffer += chunk
+            if len(buffer) > max_bytes:
+                raise ValueError(f"Response body exceeds {max_bytes} bytes")
+        body = bytes(buffer)
+    return orjson.loads(body) if ORJSON_AVAILABLE else json.loads(body)
+
+
+async def read_error_text(response: aiohttp.ClientResponse) -> str:
+    """Read at most MAX_ERROR_BYTES of an error response body."""
+    body = await response.content.read(MAX_ERROR_BYTES)
+    return body.decode(response.charset or "utf-8", errors="replace")
+
+
+async def page_contains(response: aiohttp.ClientResponse, marker: bytes) -> bool:
+    """Stream the start of a page and stop as soon as ``marker`` is seen."""
+    seen = bytearray()
+    async for chunk in response.content.iter_chunked(8192):
+        # Re-check the tail of the previous chunk so a split marker is found
+        offset = max(0, len(seen) - len(marker) + 1)
+        seen += chunk
+        if seen.find(marker, offset) != -1:
+            return True
+        if len(seen) >= MAX_PAGE_SCAN_BYTES:
+            break
+    return False
+
 
 class DemoValidator:
     """Validates demo setup and functionality."""
@@ -18,50 +115,128 @@ class DemoValidator:
     def __init__(self, backend_url: str = "http://localhost:8000", frontend_url: str = "http://localhost:3000"):
         self.backend_url = backend_url
         self.frontend_url = frontend_url
+        self._urls = SimpleNamespace(
+            health=f"{backend_url}/health",
+            ingest=f"{backend_url}/ingest",
+            search=f"{backend_url}/search",
+            ask=f"{backend_url}/ask",
+            export=f"{backend_url}/graph/export",
+            ws_stream=f"{backend_url.replace('http', 'ws')}/stream",
+        )
         self.session = None
-        self.test_results: List[Dict[str, Any]] = []
+        self._connector = None
+        self.test_results: List[TestResult] = []
+        # Formatted result lines, written to stdout once per phase
+        self._log_buffer: List[str] = []
+        # endpoint -> latency of the last successful functional check, used to
+        # tighten the benchmark timeouts
+        self._last_ok_ms: Dict[str, float] = {}
+        # Set once a warm-up request has opened a pooled connection, so
+        # latencies are measured without DNS and TCP connect costs
+        self.connections_warmed = False
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Every probe targets the same one or two hosts, so keep their
+        # connections alive and reuse them instead of reconnecting per test.
+        self._connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=32,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=self._connector,
+            timeout=DEFAULT_TIMEOUT,
+            headers=DEFAULT_HEADERS,
+            skip_auto_headers=("User-Agent",),
+        )
+        await self._warm_up()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._flush_log()
         if self.session:
             await self.session.close()
+        if self._connector and not self._connector.closed:
+            await self._connector.close()
+    
+    async def _warm_up(self):
+        """Open pooled connections to both hosts before anything is timed."""
+        async def touch(url: str, headers: Optional[Dict[str, str]] = None) -> bool:
+            try:
+                async with self.session.get(url, timeout=WARMUP_TIMEOUT, headers=headers) as response:
+                    # Drain the body so the connection goes back to the pool
+                    await response.read()
+                return True
+            except Exception:
+                return False
+        
+        warmed = await asyncio.gather(touch(self._urls.health), touch(self.frontend_url, HTML_HEADERS))
+        self.connections_warmed = any(warmed)
     
     def log_test(self, test_name: str, success: bool, message: str = "", duration_ms: float = 0):
         """Log test result."""
-        result = {
-            "test": test_name,
-            "success": success,
-            "message": message,
-            "duration_ms": duration_ms,
-            "timestamp": time.time()
-        }
-        self.test_results.append(result)
+        self.test_results.append(TestResult(test_name, success, message, duration_ms, time.time()))
         
         status = "✅" if success else "❌"
         duration_str = f" ({duration_ms:.0f}ms)" if duration_ms > 0 else ""
-        print(f"{status} {test_name}{duration_str}")
+        line = f"{status} {test_name}{duration_str}\n"
         if message:
-            print(f"   {message}")
+            line += f"   {message}\n"
+        self._log_buffer.append(line)
+    
+    def _flush_log(self):
+        """Write buffered test output to stdout in a single call."""
+        if self._log_buffer:
+            sys.stdout.write("".join(self._log_buffer))
+            self._log_buffer.clear()
+            sys.stdout.flush()
+    
+    async def _with_retries(self, coro_factory: Callable[[], Awaitable[Any]], attempts: int = 3, base: float = 0.2,
+                            retry_on: Type[Exception] = aiohttp.ClientConnectionError) -> Any:
+        """Await ``coro_factory()``, retrying dropped or refused connections.
+        
+        Backs off ``base * 2**attempt`` seconds between attempts. Timeouts are
+        not retried, since the request has already used its whole budget.
+        Non-idempotent requests should pass ``retry_on=aiohttp.ClientConnectorError``
+        so they are only retried when the connection was never established.
+        """
+        for attempt in range(attempts):
+            try:
+                return await coro_factory()
+            except asyncio.TimeoutError:
+                raise
+            except retry_on:
+                if attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(base * 2 ** attempt)
+    
+    async def _get_json(self, url: str, timeout: aiohttp.ClientTimeout,
+                        max_bytes: Optional[int] = None) -> Tuple[int, Any]:
+        """GET a JSON endpoint.
+        
+        Returns the status and the parsed JSON, or the response text when the
+        status is not 200.
+        """
+        response = await self._with_retries(lambda: self.session.get(url, timeout=timeout))
+        async with response:
+            if response.status != 200:
+                return response.status, await read_error_text(response)
+            data = await read_json(response, max_bytes)
+        return 200, data
     
     async def test_backend_health(self) -> bool:
         """Test backend health endpoint."""
         try:
-            start_time = time.time()
-            async with self.session.get(f"{self.backend_url}/health", timeout=aiohttp.ClientTimeout(total=10)) as response:
-                duration_ms = (time.time() - start_time) * 1000
-                success = response.status == 200
-                
-                if success:
-                    data = await response.json()
-                    message = f"Backend healthy: {data.get('status', 'unknown')}"
-                else:
-                    message = f"Backend unhealthy: HTTP {response.status}"
-                
-                self.log_test("Backend Health Check", success, message, duration_ms)
-                return success
+            start = perf_counter()
+            status, data = await self._get_json(self._urls.health, HEALTH_TIMEOUT)
+            duration_ms = (perf_counter() - start) * 1000
+            if status != 200:
+                self.log_test("Backend Health Check", False, f"Backend unhealthy: HTTP {status}", duration_ms)
+                return False
+            
+            self.log_test("Backend Health Check", True, f"Backend healthy: {data.get('status', 'unknown')}", duration_ms)
+            return True
                 
         except Exception as e:
             self.log_test("Backend Health Check", False, f"Connection failed: {e}")
@@ -70,21 +245,18 @@ class DemoValidator:
     async def test_frontend_accessibility(self) -> bool:
         """Test frontend accessibility."""
         try:
-            start_time = time.time()
-            async with self.session.get(self.frontend_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                duration_ms = (time.time() - start_time) * 1000
-                success = response.status == 200
+            start = perf_counter()
+            response = await self._with_retries(lambda: self.session.get(self.frontend_url, timeout=HEALTH_TIMEOUT, headers=HTML_HEADERS))
+            async with response:
+                duration_ms = (perf_counter() - start) * 1000
+                if response.status != 200:
+                    self.log_test("Frontend Accessibility", False, f"Frontend not accessible: HTTP {response.status}", duration_ms)
+                    return False
                 
-                if success:
-                    content = await response.text()
-                    has_title = "AI Knowledge Mapper" in content
-                    message = "Frontend accessible" + (" with correct title" if has_title else " but title missing")
-                    success = success and has_title
-                else:
-                    message = f"Frontend not accessible: HTTP {response.status}"
-                
-                self.log_test("Frontend Accessibility", success, message, duration_ms)
-                return success
+                has_title = await page_contains(response, TITLE_MARKER)
+                message = "Frontend accessible" + (" with correct title" if has_title else " but title missing")
+                self.log_test("Frontend Accessibility", has_title, message, duration_ms)
+                return has_title
                 
         except Exception as e:
             self.log_test("Frontend Accessibility", False, f"Connection failed: {e}")
@@ -98,25 +270,22 @@ class DemoValidator:
         }
         
         try:
-            start_time = time.time()
-            async with self.session.post(
-                f"{self.backend_url}/ingest",
-                json=test_doc,
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                duration_ms = (time.time() - start_time) * 1000
-                success = response.status == 200
-                
-                if success:
-                    data = await response.json()
-                    chunks = data.get('chunks_processed', 0)
-                    message = f"Processed {chunks} chunks successfully"
-                else:
-                    error_text = await response.text()
-                    message = f"Ingestion failed: {response.status} - {error_text}"
+            start = perf_counter()
+            response = await self._with_retries(lambda: self.session.post(
+                self._urls.ingest,
+                json=test_doc
+            ), retry_on=aiohttp.ClientConnectorError)
+            async with response:
+                duration_ms = (perf_counter() - start) * 1000
+                if response.status != 200:
+                    error_text = await read_error_text(response)
+                    self.log_test("Text Ingestion", False, f"Ingestion failed: {response.status} - {error_text}", duration_ms)
+                    return False
                 
-                self.log_test("Text Ingestion", success, message, duration_ms)
-                return success
+                data = await read_json(response)
+                self._last_ok_ms["ingest"] = duration_ms
+                self.log_test("Text Ingestion", True, f"Processed {data.get('chunks_processed', 0)} chunks successfully", duration_ms)
+                return True
                 
         except asyncio.TimeoutError:
             self.log_test("Text Ingestion", False, "Timeout during ingestion")
@@ -130,26 +299,24 @@ class DemoValidator:
         search_query = {"q": "OpenAI", "k": 5}
         
         try:
-            start_time = time.time()
-            async with self.session.post(
-                f"{self.backend_url}/search",
+            start = perf_counter()
+            response = await self._with_retries(lambda: self.session.post(
+                self._urls.search,
                 json=search_query,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                duration_ms = (time.time() - start_time) * 1000
-                success = response.status == 200
+                timeout=SEARCH_TIMEOUT
+            ), retry_on=aiohttp.ClientConnectorError)
+            async with response:
+                duration_ms = (perf_counter() - start) * 1000
+                if response.status != 200:
+                    error_text = await read_error_text(response)
+                    self.log_test("Search Functionality", False, f"Search failed: {response.status} - {error_text}", duration_ms)
+                    return False
                 
-                if success:
-                    data = await response.json()
-                    results = data.get('results', [])
-                    message = f"Found {len(results)} search results"
-                    success = len(results) > 0
-                else:
-                    error_text = await response.text()
-                    message = f"Search failed: {response.status} - {error_text}"
-                
-                self.log_test("Search Functionality", success, message, duration_ms)
-                return success
+                data = await read_json(response)
+                results = data.get('results', [])
+                self._last_ok_ms["search"] = duration_ms
+                self.log_test("Search Functionality", bool(results), f"Found {len(results)} search results", duration_ms)
+                return bool(results)
                 
         except Exception as e:
             self.log_test("Search Functionality", False, f"Search error: {e}")
@@ -160,27 +327,24 @@ class DemoValidator:
         question = {"q": "What is OpenAI?"}
         
         try:
-            start_time = time.time()
-            async with self.session.post(
-                f"{self.backend_url}/ask",
-                json=question,
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                duration_ms = (time.time() - start_time) * 1000
-                success = response.status == 200
-                
-                if success:
-                    data = await response.json()
-                    answer = data.get('answer', '')
-                    citations = data.get('citations', [])
-                    message = f"Generated answer with {len(citations)} citations"
-                    success = len(answer) > 0
-                else:
-                    error_text = await response.text()
-                    message = f"Q&A failed: {response.status} - {error_text}"
+            start = perf_counter()
+            response = await self._with_retries(lambda: self.session.post(
+                self._urls.ask,
+                json=question
+            ), retry_on=aiohttp.ClientConnectorError)
+            async with response:
+                duration_ms = (perf_counter() - start) * 1000
+                if response.status != 200:
+                    error_text = await read_error_text(response)
+                    self.log_test("Question Answering", False, f"Q&A failed: {response.status} - {error_text}", duration_ms)
+                    return False
                 
-                self.log_test("Question Answering", success, message, duration_ms)
-                return success
+                data = await read_json(response)
+                has_answer = bool(data.get('answer', ''))
+                citations = data.get('citations', [])
+                self._last_ok_ms["ask"] = duration_ms
+                self.log_test("Question Answering", has_answer, f"Generated answer with {len(citations)} citations", duration_ms)
+                return has_answer
                 
         except Exception as e:
             self.log_test("Question Answering", False, f"Q&A error: {e}")
@@ -189,123 +353,164 @@ class DemoValidator:
     async def test_graph_export(self) -> bool:
         """Test graph export functionality."""
         try:
-            start_time = time.time()
-            async with self.session.get(
-                f"{self.backend_url}/graph/export",
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                duration_ms = (time.time() - start_time) * 1000
-                success = response.status == 200
-                
-                if success:
-                    data = await response.json()
-                    nodes = len(data.get('nodes', []))
-                    edges = len(data.get('edges', []))
-                    message = f"Exported graph with {nodes} nodes and {edges} edges"
-                else:
-                    error_text = await response.text()
-                    message = f"Export failed: {response.status} - {error_text}"
-                
-                self.log_test("Graph Export", success, message, duration_ms)
-                return success
+            start = perf_counter()
+            status, data = await self._get_json(
+                self._urls.export,
+                EXPORT_TIMEOUT,
+                max_bytes=MAX_EXPORT_BYTES
+            )
+            duration_ms = (perf_counter() - start) * 1000
+            if status != 200:
+                self.log_test("Graph Export", False, f"Export failed: {status} - {data}", duration_ms)
+                return False
+            
+            nodes = len(data.get('nodes', []))
+            edges = len(data.get('edges', []))
+            self.log_test("Graph Export", True, f"Exported graph with {nodes} nodes and {edges} edges", duration_ms)
+            return True
                 
         except Exception as e:
             self.log_test("Graph Export", False, f"Export error: {e}")
             return False
     
     async def test_websocket_connection(self) -> bool:
-        """Test WebSocket connection (simplified check)."""
+        """Test WebSocket connection with a real upgrade handshake."""
         try:
-            # For now, just check if the WebSocket endpoint is accessible
-            # A full WebSocket test would require more complex setup
-            start_time = time.time()
-            async with self.session.get(
-                f"{self.backend_url.replace('http', 'ws')}/stream",
-                timeout=aiohttp.ClientTimeout(total=5)
-            ) as response:
-                duration_ms = (time.time() - start_time) * 1000
-                # WebSocket upgrade should return 101 or fail with specific error
-                success = response.status in [101, 400, 426]  # 400/426 indicate WebSocket endpoint exists
-                message = "WebSocket endpoint accessible"
-                
-                self.log_test("WebSocket Connection", success, message, duration_ms)
-                return success
-                
-        except Exception as e:
-            # WebSocket connection attempts often throw exceptions, which is expected
-            self.log_test("WebSocket Connection", True, "WebSocket endpoint detected (connection attempt failed as expected)")
+            start = perf_counter()
+            ws = await asyncio.wait_for(
+                self._with_retries(lambda: self.session.ws_connect(self._urls.ws_stream, heartbeat=None)),
+                timeout=WS_HANDSHAKE_TIMEOUT
+            )
+            duration_ms = (perf_counter() - start) * 1000
+            await ws.close()
+            
+            self.log_test("WebSocket Connection", True, "WebSocket upgrade accepted", duration_ms)
             return True
+            
+        except aiohttp.WSServerHandshakeError as e:
+            # 400/426 mean the endpoint exists but refused this upgrade
+            success = e.status in (400, 426)
+            message = f"WebSocket endpoint present but rejected upgrade: HTTP {e.status}" if success else f"WebSocket handshake failed: HTTP {e.status}"
+            self.log_test("WebSocket Connection", success, message)
+            return success
+        except asyncio.TimeoutError:
+            self.log_test("WebSocket Connection", False, "WebSocket handshake timed out")
+            return False
+        except Exception as e:
+            self.log_test("WebSocket Connection", False, f"WebSocket connection failed: {e}")
+            return False
     
-    async def test_performance_benchmarks(self) -> bool:
-        """Test performance benchmarks for demo suitability."""
-        benchmarks = {
-            "ingestion_time": None,
-            "search_time": None,
-            "qa_time": None
-        }
+    def _bench_timeout(self, endpoint: str, upper: aiohttp.ClientTimeout, threshold_ms: float) -> aiohttp.ClientTimeout:
+        """Shrink ``upper`` to three times the endpoint's last successful latency.
         
-        # Test ingestion performance
+        The result never drops below the slowness threshold, so a timeout can
+        only fire once the probe already counts as slow.
+        """
+        last_ms = self._last_ok_ms.get(endpoint)
+        if last_ms is None:
+            return upper
+        total = min(upper.total, max(threshold_ms, 3 * last_ms) / 1000)
+        return aiohttp.ClientTimeout(total=total, connect=upper.connect, sock_read=upper.sock_read)
+    
+    async def _bench_ingest(self, timeout: aiohttp.ClientTimeout) -> float:
+        """Time a single ingestion request."""
         test_doc = {
             "doc_id": "perf_test_doc",
             "text": "Performance test document with multiple entities like Google, Microsoft, and artificial intelligence concepts."
         }
         
-        try:
-            start_time = time.time()
-            async with self.session.post(
-                f"{self.backend_url}/ingest",
-                json=test_doc,
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                benchmarks["ingestion_time"] = (time.time() - start_time) * 1000
-        except:
-            pass
-        
-        # Test search performance
-        try:
-            start_time = time.time()
-            async with self.session.post(
-                f"{self.backend_url}/search",
-                json={"q": "Google", "k": 5},
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                benchmarks["search_time"] = (time.time() - start_time) * 1000
-        except:
-            pass
+        start = perf_counter()
+        async with self.session.post(
+            self._urls.ingest,
+            json=test_doc,
+            timeout=timeout
+        ) as response:
+            return (perf_counter() - start) * 1000
+    
+    async def _bench_search(self, timeout: aiohttp.ClientTimeout) -> float:
+        """Time a single search request."""
+        start = perf_counter()
+        async with self.session.post(
+            self._urls.search,
+            json={"q": "Google", "k": 5},
+            timeout=timeout
+        ) as response:
+            return (perf_counter() - start) * 1000
+    
+    async def _bench_qa(self, timeout: aiohttp.ClientTimeout) -> float:
+        """Time a single Q&A request."""
+        start = perf_counter()
+        async with self.session.post(
+            self._urls.ask,
+            json={"q": "What is Google?"},
+            timeout=timeout
+        ) as response:
+            return (perf_counter() - start) * 1000
+    
+    async def test_performance_benchmarks(self) -> bool:
+        """Test performance benchmarks for demo suitability."""
+        # (label, probe, timeout, slowness threshold in ms)
+        probes = [
+            (label, probe, self._bench_timeout(endpoint, upper, threshold_ms), threshold_ms)
+            for label, probe, endpoint, upper, threshold_ms in (
+                ("ingestion", self._bench_ingest, "ingest", DEFAULT_TIMEOUT, 30000),
+                ("search", self._bench_search, "search", BENCH_SEARCH_TIMEOUT, 5000),
+                ("Q&A", self._bench_qa, "ask", BENCH_QA_TIMEOUT, 15000),
+            )
+        ]
         
-        # Test Q&A performance
-        try:
-            start_time = time.time()
-            async with self.session.post(
-                f"{self.backend_url}/ask",
-                json={"q": "What is Google?"},
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                benchmarks["qa_time"] = (time.time() - start_time) * 1000
-        except:
-            pass
+        # The probes are independent, so run them together over the shared
+        # connection pool.
+        timings = await asyncio.gather(
+            *(probe(timeout) for _, probe, timeout, _ in probes),
+            return_exceptions=True
+        )
         
-        # Evaluate performance
-        success = True
+        # Evaluate performance; a probe that times out or errors counts as a
+        # failure rather than a missing measurement
         issues = []
+        for (label, _, timeout, threshold_ms), timing in zip(probes, timings):
+            if isinstance(timing, asyncio.TimeoutError):
+                issues.append(f"{label} timed out after {timeout.total:g}s")
+            elif isinstance(timing, BaseException):
+                issues.append(f"{label} failed: {timing!r}")
+            elif timing > threshold_ms:
+                issues.append(f"Slow {label}: {timing:.0f}ms")
         
-        if benchmarks["ingestion_time"] and benchmarks["ingestion_time"] > 30000:  # 30 seconds
-            issues.append(f"Slow ingestion: {benchmarks['ingestion_time']:.0f}ms")
-            success = False
-        
-        if benchmarks["search_time"] and benchmarks["search_time"] > 5000:  # 5 seconds
-            issues.append(f"Slow search: {benchmarks['search_time']:.0f}ms")
-            success = False
-        
-        if benchmarks["qa_time"] and benchmarks["qa_time"] > 15000:  # 15 seconds
-            issues.append(f"Slow Q&A: {benchmarks['qa_time']:.0f}ms")
-            success = False
-        
+        success = not issues
         message = "Performance acceptable for demo" if success else f"Performance issues: {', '.join(issues)}"
         self.log_test("Performance Benchmarks", success, message)
         
         return success
     
+    async def run_infrastructure_tests(self) -> List[bool]:
+        """Probe backend, frontend and WebSocket endpoints concurrently."""
+        # The probes hit independent endpoints, so the phase takes as long as
+        # the slowest one; results are written in completion order.
+        try:
+            return await asyncio.gather(
+                self.test_backend_health(),
+                self.test_frontend_accessibility(),
+                self.test_websocket_connection(),
+            )
+        finally:
+            self._flush_log()
+    
+    async def run_functionality_tests(self) -> List[bool]:
+        """Run ingestion, then the search, Q&A and export checks concurrently."""
+        # Search and Q&A query the ingested document, so ingestion goes first;
+        # the remaining checks are independent of each other.
+        try:
+            ingestion_ok = await self.test_text_ingestion()
+            search_ok, qa_ok, export_ok = await asyncio.gather(
+                self.test_search_functionality(),
+                self.test_question_answering(),
+                self.test_graph_export(),
+            )
+        finally:
+            self._flush_log()
+        return [ingestion_ok, search_ok, qa_ok, export_ok]
+    
     async def run_comprehensive_validation(self) -> bool:
         """Run comprehensive validation of all demo functionality."""
         print("🔍 AI KNOWLEDGE MAPPER - COMPREHENSIVE DEMO VALIDATION")
@@ -314,24 +519,20 @@ class DemoValidator:
         
         # Core infrastructure tests
         print("🏗️  Infrastructure Tests:")
-        backend_ok = await self.test_backend_health()
-        frontend_ok = await self.test_frontend_accessibility()
-        websocket_ok = await self.test_websocket_connection()
+        backend_ok, frontend_ok, websocket_ok = await self.run_infrastructure_tests()
         
         print()
         
         # Functionality tests
         print("⚙️  Functionality Tests:")
-        ingestion_ok = await self.test_text_ingestion()
-        search_ok = await self.test_search_functionality()
-        qa_ok = await self.test_question_answering()
-        export_ok = await self.test_graph_export()
+        ingestion_ok, search_ok, qa_ok, export_ok = await self.run_functionality_tests()
         
         print()
         
         # Performance tests
         print("🚀 Performance Tests:")
         performance_ok = await self.test_performance_benchmarks()
+        self._flush_log()
         
         print()
         
@@ -368,17 +569,18 @@ class DemoValidator:
         
         # Save detailed results
         results_file = Path(f"validation_results_{int(time.time())}.json")
-        with open(results_file, 'w') as f:
-            json.dump({
-                "summary": {
-                    "passed_tests": passed_tests,
-                    "total_tests": total_tests,
-                    "success_rate": success_rate,
-                    "overall_success": overall_success,
-                    "timestamp": time.time()
-                },
-                "test_results": self.test_results
-            }, f, indent=2)
+        payload = {
+            "summary": {
+                "passed_tests": passed_tests,
+                "total_tests": total_tests,
+                "success_rate": success_rate,
+                "overall_success": overall_success,
+                "connections_warmed": self.connections_warmed,
+                "timestamp": time.time()
+            },
+            "test_results": self.test_results
+        }
+        await asyncio.to_thread(write_json, results_file, payload)
         
         print(f"\n💾 Detailed results saved to: {results_file}")
         print("="*60)
@@ -403,9 +605,7 @@ async def main():
             print("="*50)
             print()
             
-            backend_ok = await validator.test_backend_health()
-            frontend_ok = await validator.test_frontend_accessibility()
-            websocket_ok = await validator.test_websocket_connection()
+            backend_ok, frontend_ok, websocket_ok = await validator.run_infrastructure_tests()
             
             quick_success = backend_ok and frontend_ok and websocket_ok
             